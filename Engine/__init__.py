@@ -1,60 +1,40 @@
-from Engine.admin_views.setup import setup_admin_views
-from flask_admin import Admin, AdminIndexView, expose
-from flask_login import LoginManager, current_user
-from flask_admin.contrib.sqla import ModelView
-from flask import Flask, redirect, url_for
+from Engine.templating import configure_templates, precompile_templates
+from Engine.socket_queue import create_client_manager
+from Engine.idempotency import idempotency_store
+from Engine.data_version import data_version
+from Engine.leaderboard import leaderboard
+from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_sqlalchemy import SQLAlchemy
+from flask_login import LoginManager
 from flask_socketio import SocketIO
 from Engine.config import Config
-from flask_admin import Admin
+from typing import Any, Optional
+from flask import Flask
 
-login_manager: LoginManager = LoginManager()
+VOTER_PROFILE: str = 'voter'
+FULL_PROFILE: str = 'full'
 
-class SecureAdminIndexView(AdminIndexView):
-    """
-    A custom AdminIndexView that ensures the user is authenticated
-    before accessing the admin index page. If the user is not
-    authenticated, they will be redirected to the login page.
-    """
+login_manager: LoginManager = LoginManager()
 
-    @expose('/')
-    def index(self):
-        """
-        Override the index method to check user authentication.
-        Redirects unauthenticated users to the login page.
-        """
-        if not current_user.is_authenticated:
-            return redirect(url_for('app_admin.login_form'))
-        return super(SecureAdminIndexView, self).index()
+db: SQLAlchemy = SQLAlchemy()
+socketio: SocketIO = SocketIO()
 
-class AdminModelView(ModelView):
+def __getattr__(name: str) -> Any:
     """
-    A custom ModelView for the admin interface that restricts access
-    to authenticated users only. Redirects unauthorized users to the
-    login page.
+    Builds the admin interface only when something outside create_app asks for it,
+    so importing Engine does not load Flask-Admin and WTForms.
     """
+    if name == 'main_admin':
+        from Engine.admin_views.setup import get_admin
+        return get_admin(db)
 
-    def is_accessible(self):
-        """
-        Determines if the current user has access to the admin view.
-        Returns True if the user is authenticated, meaning the user is an admin.
-        """
-        return current_user.is_authenticated
+    if name in ('SecureAdminIndexView', 'AdminModelView'):
+        from Engine.admin_views import setup
+        return getattr(setup, name)
 
-    def inaccessible_callback(self, name, **kwargs):
-        """
-        Redirects the user to the login page if they do not have access
-        to the requested admin view.
-        """
-        return redirect(url_for('app_admin.login_form'))
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-db: SQLAlchemy = SQLAlchemy()
-main_admin: Admin = Admin(index_view=SecureAdminIndexView())
-socketio: SocketIO = SocketIO()
-
-setup_admin_views(main_admin, db)
-
-def create_app(config_class=Config) -> Flask:
+def create_app(config_class=Config, profile: Optional[str] = None) -> Flask:
     """
     Creates and configures an instance of the Flask application.
 
@@ -62,24 +42,68 @@ def create_app(config_class=Config) -> Flask:
     initializes the database and socketio, and registers the blueprints for the
     index, candidate, and error views.
 
+    The 'voter' profile only serves the public pages and sockets. It never imports
+    Flask-Admin, WTForms or the admin and login views, which keeps cold starts and
+    memory of scaled out voter workers small.
+
+    Args:
+        config_class: The configuration object to load.
+        profile (Optional[str]): 'full' or 'voter', defaults to the APP_PROFILE config.
+
     Returns:
     --------
         app: A Flask application instance.
     """
     app: Flask = Flask(__name__)
     app.config.from_object(config_class)
+    configure_templates(app)
+
+    trusted_proxies: int = app.config.get('TRUSTED_PROXY_COUNT', 0)
+
+    # request.remote_addr becomes the client behind the trusted proxies
+    if trusted_proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxies) # type: ignore
 
     login_manager.init_app(app)
     db.init_app(app)
-    socketio.init_app(app)
 
-    main_admin.init_app(app)
+    # Session hooks that keep the worker caches current with every commit
+    import Engine.cache_hooks
+
+    # Handlers registered before init_app are kept by every app this process creates
+    import Engine.index.events
+
+    client_manager = create_client_manager(
+        app.config.get('SOCKETIO_MESSAGE_QUEUE'),
+        channel=app.config.get('SOCKETIO_CHANNEL', 'socketio'),
+        max_pending=app.config.get('SOCKETIO_MAX_PENDING_PACKETS', 64)
+    )
+
+    socketio.init_app(
+        app,
+        client_manager=client_manager,
+        max_http_buffer_size=app.config.get('SOCKETIO_MAX_HTTP_BUFFER_SIZE', 100_000)
+    )
+
+    idempotency_store.init_app(app)
+    leaderboard.init_app(app)
+    data_version.init_app(app)
 
-    from Engine.user.views import app_admin
     from Engine.index.views import index
 
     app.register_blueprint(index)
-    app.register_blueprint(app_admin)
+
+    if (profile or app.config.get('APP_PROFILE', FULL_PROFILE)) != VOTER_PROFILE:
+        from Engine.admin_views.setup import get_admin
+        from Engine.user.security import hashing_pool, login_limiter
+        from Engine.export.views import export
+        from Engine.user.views import app_admin
+
+        hashing_pool.init_app(app)
+        login_limiter.init_app(app)
+        get_admin(db).init_app(app)
+        app.register_blueprint(app_admin)
+        app.register_blueprint(export)
 
     def after_request(response):
         """
@@ -92,4 +116,6 @@ def create_app(config_class=Config) -> Flask:
 
     app.after_request(after_request)
 
+    precompile_templates(app)
+
     return app
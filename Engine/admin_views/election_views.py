@@ -1,10 +1,12 @@
-from wtforms import StringField, SelectField, FieldList, FormField, DateTimeField
+from wtforms import StringField, SelectField, FieldList, FormField, DateTimeField, HiddenField
 from werkzeug.wrappers.response import Response
 from flask import request, redirect, url_for
 from wtforms.validators import DataRequired
 from flask_admin import BaseView, expose
+from Engine.idempotency import idempotent, mark_completed
 from flask_wtf import FlaskForm
 from typing import Dict, List, Union
+from uuid import uuid4
 
 class DataListField(StringField):
     def __init__(self, label=None, validators=None, datalist=None, **kwargs):
@@ -58,7 +60,9 @@ class ElectionForm(FlaskForm):
         start_date_and_time: The start date and time of the election.
         end_date_and_time: The end date and time of the election.
         candidates: A list of candidate forms.
+        idempotency_key: A token generated per rendered form so resubmissions are replayed.
     """
+    idempotency_key: HiddenField = HiddenField(default=lambda: uuid4().hex)
     title: StringField = StringField('Election Title', default="sdgadghh", validators=[DataRequired()])
     start_date_and_time: DateTimeField = DateTimeField('Start Date and Time', format='%Y-%m-%dT%H:%M', validators=[])
     end_date_and_time: DateTimeField = DateTimeField('End Date and Time', format='%Y-%m-%dT%H:%M', validators=[])
@@ -72,10 +76,14 @@ class ElectionView(BaseView):
         index: Displays the form for creating or updating an election and handles form submission.
     """
     @expose('/', methods=('GET', 'POST'))
+    @idempotent
     def index(self) -> Union[Response, str]:
         """
         Handles GET and POST requests for creating or updating an election.
 
+        The election, its new positions and candidates are committed together and a
+        resubmitted form carrying the same idempotency key gets the first response back.
+
         Returns:
             Response or str: The rendered template or redirect response.
         """
@@ -93,6 +101,9 @@ class ElectionView(BaseView):
                 for error in errors:
                     print(f"Error in {field}: {error}")
 
+            # The corrected form is a new submission
+            form.idempotency_key.data = uuid4().hex
+
             return self.render('admin/new_election.html', form=form)
 
         election: Election = Election(
@@ -102,7 +113,7 @@ class ElectionView(BaseView):
         )
 
         db.session.add(election)
-        db.session.commit()
+        db.session.flush()
 
         # Collect all unique positions from candidate data
         positions_data: set = set(candidate_data['position'] for candidate_data in form.candidates.data)
@@ -125,7 +136,7 @@ class ElectionView(BaseView):
         # Bulk insert new positions
         if new_positions:
             db.session.add_all(new_positions)
-            db.session.commit()
+            db.session.flush()
 
         # Update the positions map
         for position in new_positions:
@@ -149,5 +160,6 @@ class ElectionView(BaseView):
         # Bulk insert candidates
         db.session.add_all(candidates)
         db.session.commit()
+        mark_completed()
 
         return redirect(url_for('.index'))
@@ -1,12 +1,54 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
-    from flask_admin import Admin
     from flask_sqlalchemy import SQLAlchemy
 
+from flask_admin import Admin, AdminIndexView, expose
 from Engine.admin_views.election_views import ElectionView
 from flask_admin.contrib.sqla import ModelView
+from flask import redirect, url_for
+from flask_login import current_user
+
+class SecureAdminIndexView(AdminIndexView):
+    """
+    A custom AdminIndexView that ensures the user is authenticated
+    before accessing the admin index page. If the user is not
+    authenticated, they will be redirected to the login page.
+    """
+
+    @expose('/')
+    def index(self):
+        """
+        Override the index method to check user authentication.
+        Redirects unauthenticated users to the login page.
+        """
+        if not current_user.is_authenticated:
+            return redirect(url_for('app_admin.login_form'))
+        return super(SecureAdminIndexView, self).index()
+
+class AdminModelView(ModelView):
+    """
+    A custom ModelView for the admin interface that restricts access
+    to authenticated users only. Redirects unauthorized users to the
+    login page.
+    """
+
+    def is_accessible(self):
+        """
+        Determines if the current user has access to the admin view.
+        Returns True if the user is authenticated, meaning the user is an admin.
+        """
+        return current_user.is_authenticated
+
+    def inaccessible_callback(self, name, **kwargs):
+        """
+        Redirects the user to the login page if they do not have access
+        to the requested admin view.
+        """
+        return redirect(url_for('app_admin.login_form'))
+
+main_admin: Optional[Admin] = None
 
 def setup_admin_views(main_admin: Admin, database: SQLAlchemy) -> None:
 
@@ -18,3 +60,21 @@ def setup_admin_views(main_admin: Admin, database: SQLAlchemy) -> None:
 
     for model in model_collection:
         main_admin.add_view(ModelView(model, database.session))
+
+def get_admin(database: SQLAlchemy) -> Admin:
+    """
+    Returns the admin interface, building it and its views on first use.
+
+    Args:
+        database (SQLAlchemy): The database the model views read from.
+
+    Returns:
+        Admin: The shared admin instance.
+    """
+    global main_admin
+
+    if main_admin is None:
+        main_admin = Admin(index_view=SecureAdminIndexView())
+        setup_admin_views(main_admin, database)
+
+    return main_admin
@@ -0,0 +1,74 @@
+from Engine.models import BaseModel, Candidate, Election, ElectionEligibility, Position, Voter
+from Engine.read_models import election_read_model
+from Engine.eligibility import eligibility_index
+from Engine.data_version import Change, data_version
+from Engine.leaderboard import leaderboard
+from typing import Any, List, Optional, Set, Tuple, Type, cast
+from sqlalchemy.orm import Session
+from sqlalchemy import event
+from Engine import db
+
+PENDING_CHANGES_KEY: str = 'data_version_pending_changes'
+
+# Models cached in worker memory, changes to them are shared through data_version
+SHARED_MODELS: Tuple[Type[BaseModel], ...] = (Candidate, Election, ElectionEligibility, Position, Voter)
+ELIGIBILITY_TABLES: Tuple[str, ...] = ('voters', 'elections', 'candidates', 'election_eligibilities')
+ELECTION_GRAPH_TABLES: Tuple[str, ...] = ('elections', 'candidates', 'positions')
+
+def invalidate_election_graphs(changes: List[Change]) -> None:
+    """
+    Drops the read models and leaderboards of the elections whose graph changed.
+    """
+    # Positions are shared by every election
+    if any(change.table_name == 'positions' for change in changes):
+        election_read_model.invalidate()
+        leaderboard.invalidate()
+        return
+
+    elections: Set[int] = {change.election_id for change in changes if change.election_id is not None}
+
+    for election_id in elections:
+        election_read_model.invalidate(election_id)
+        leaderboard.invalidate(election_id)
+
+data_version.subscribe(ELIGIBILITY_TABLES, eligibility_index.apply_changes)
+data_version.subscribe(ELECTION_GRAPH_TABLES, invalidate_election_graphs)
+
+@event.listens_for(db.session, 'after_flush')
+def record_data_changes(session: Session, flush_context: Any) -> None:
+    """
+    Records the cached rows this flush changed so every worker, this one on commit, updates its caches.
+    """
+    changes: List[Change] = []
+
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(instance, SHARED_MODELS) or (instance in session.dirty and not session.is_modified(instance)):
+            continue
+
+        # A new position has no candidates yet, the ones added with it are recorded themselves
+        if isinstance(instance, Position) and instance in session.new:
+            continue
+
+        election_id: Any = instance.id if isinstance(instance, Election) else getattr(instance, 'election_id', None)
+        changes.append(Change(instance.__tablename__, cast(Optional[int], instance.id), cast(Optional[int], election_id)))
+
+    if changes:
+        data_version.record(session, changes)
+        session.info.setdefault(PENDING_CHANGES_KEY, []).extend(changes)
+
+@event.listens_for(db.session, 'after_commit')
+def publish_data_changes(session: Session) -> None:
+    """
+    Hands the committed changes to the same listeners that handle the changes of other workers.
+    """
+    changes: List[Change] = session.info.pop(PENDING_CHANGES_KEY, [])
+
+    if changes:
+        data_version.dispatch(changes)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_data_changes(session: Session) -> None:
+    """
+    Forgets the changes of a transaction that was rolled back.
+    """
+    session.info.pop(PENDING_CHANGES_KEY, None)
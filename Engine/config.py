@@ -8,4 +8,48 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URI')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    TEMPLATES_AUTO_RELOAD = True
+
+    # 'production' precompiles templates into a shared bytecode cache and stops
+    # checking them for changes, see Engine/templating.py
+    TEMPLATE_MODE = os.environ.get('TEMPLATE_MODE', 'development')
+    TEMPLATE_BYTECODE_CACHE_DIR = os.environ.get('TEMPLATE_BYTECODE_CACHE_DIR')
+    TEMPLATES_AUTO_RELOAD = TEMPLATE_MODE != 'production'
+
+    # 'full' serves everything, 'voter' skips the admin interface and login views
+    APP_PROFILE = os.environ.get('APP_PROFILE', 'full')
+
+    # Replayed responses for retried form submissions, see Engine/idempotency.py
+    IDEMPOTENCY_TTL = 600
+    IDEMPOTENCY_MAX_ENTRIES = 4096
+    IDEMPOTENCY_WAIT_TIMEOUT = 30
+
+    # Number of candidates kept per position by the live leaderboard, and number of
+    # newest vote ids a loaded board remembers to skip votes it already counted
+    LEADERBOARD_SIZE = 3
+    LEADERBOARD_LOAD_OVERLAP = 1024
+
+    # Seconds between polls for changes other workers made to cached data, and
+    # seconds those changes are kept, see Engine/data_version.py
+    DATA_VERSION_POLL_INTERVAL = 1
+    DATA_VERSION_RETENTION = 3600
+
+    # Password hashing off the request thread and login attempts per IP, see Engine/user/security.py
+    PASSWORD_HASH_WORKERS = 2
+    PASSWORD_HASH_MAX_PENDING = 16
+    PASSWORD_HASH_TIMEOUT = 10
+    LOGIN_RATE_LIMIT_CAPACITY = 5
+    LOGIN_RATE_LIMIT_REFILL_PER_SECOND = 1 / 12
+
+    # Number of proxies in front of the app whose X-Forwarded-For entry is trusted,
+    # 0 uses the connecting address. Set it behind a load balancer so login
+    # attempts are limited per client and not per balancer.
+    TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 0))
+
+    # Socket.IO fan-out between workers, see Engine/socket_queue.py
+    # None or memory:// for a single process, sqlite:///<path> to share emits through a file,
+    # or a redis://, kafka://, zmq+tcp:// or amqp:// broker. Vote counts reach the
+    # leaderboards of other workers through it.
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+    SOCKETIO_CHANNEL = 'marv'
+    SOCKETIO_MAX_PENDING_PACKETS = 64
+    SOCKETIO_MAX_HTTP_BUFFER_SIZE = 100_000
@@ -0,0 +1,219 @@
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import Row
+from datetime import datetime, timedelta
+from flask import Flask
+from uuid import uuid4
+import threading
+import time
+import os
+
+class Change(NamedTuple):
+    """
+    A committed change to a row that workers cache in memory.
+
+    Attributes:
+        table_name: The table of the changed row.
+        row_id: The primary key of the changed row.
+        election_id: The election the row belongs to, if any.
+    """
+    table_name: str
+    row_id: Optional[int]
+    election_id: Optional[int]
+
+Listener = Callable[[List[Change]], None]
+
+class DataVersion:
+    """
+    Shares the changes to admin edited data between workers through the database.
+
+    Workers cache elections, candidates, positions and voters in memory and only
+    see the commits made in their own process. Every flush that changes such data
+    adds a row per changed row to `data_changes` in the same transaction. `sync`
+    reads the rows added after the highest id it saw and hands the ones other
+    workers recorded to the listeners of their table, so ballots and reads never
+    wait on it. It runs on a background task every DATA_VERSION_POLL_INTERVAL
+    seconds.
+
+    Ids are given out when a row is inserted, so a transaction can commit a lower
+    id than one already seen. `sync` reads the last `overlap` ids again and skips
+    the ones it already handled.
+    """
+
+    def __init__(self, interval: float = 1, retention: float = 3600, overlap: int = 64) -> None:
+        """
+        Initialize a DataVersion instance.
+
+        Args:
+            interval (float): Seconds between polls, 0 disables the background poll.
+            retention (float): Seconds a change row is kept before being pruned.
+            overlap (int): The number of ids below the highest seen one that are read again.
+        """
+        self.interval: float = interval
+        self.retention: float = retention
+        self.overlap: int = overlap
+        self._lock: threading.Lock = threading.Lock()
+        self._highest: Optional[int] = None
+        self._handled: Set[int] = set()
+        self._listeners: Dict[str, List[Listener]] = {}
+        self._origin: Tuple[int, str] = (os.getpid(), uuid4().hex)
+        self._next_prune: float = 0
+
+    @property
+    def origin(self) -> str:
+        """
+        Identifies this worker process in the rows it records, forked workers get their own.
+        """
+        if self._origin[0] != os.getpid():
+            self._origin = (os.getpid(), uuid4().hex)
+
+        return self._origin[1]
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Reads the poll settings from the application config and starts polling.
+
+        Args:
+            app (Flask): The application whose database is polled.
+        """
+        from Engine import socketio
+
+        self.interval = app.config.get('DATA_VERSION_POLL_INTERVAL', self.interval)
+        self.retention = app.config.get('DATA_VERSION_RETENTION', self.retention)
+
+        with self._lock:
+            self._highest = None
+            self._handled.clear()
+
+        if self.interval:
+            socketio.start_background_task(self._poll, app)
+
+    def subscribe(self, table_names: Iterable[str], listener: Listener) -> None:
+        """
+        Registers a function that updates a cache when rows of some tables changed.
+
+        Args:
+            table_names (Iterable[str]): The tables the cache is built from.
+            listener (Listener): Called with the changes committed to those tables.
+        """
+        for table_name in table_names:
+            self._listeners.setdefault(table_name, []).append(listener)
+
+    def record(self, session: Session, changes: Iterable[Change]) -> None:
+        """
+        Adds the change rows to the transaction of a flush.
+
+        Args:
+            session (Session): The session being flushed.
+            changes (Iterable[Change]): The rows the flush changed.
+        """
+        from Engine.models import DataChange
+        from sqlalchemy import insert
+
+        origin: str = self.origin
+        now: datetime = datetime.now()
+
+        session.connection().execute(insert(DataChange.__table__), [
+            {'origin': origin, 'created_at': now, **change._asdict()} for change in changes
+        ])
+
+    def sync(self) -> None:
+        """
+        Hands the changes other workers committed since the last sync to their listeners.
+
+        The first sync only finds the highest id, caches built after it are current.
+        """
+        from Engine.models import DataChange
+        from sqlalchemy import func
+        from Engine import db
+
+        with self._lock:
+            highest: Optional[int] = self._highest
+
+        if highest is None:
+            with self._lock:
+                self._highest = db.session.query(func.coalesce(func.max(DataChange.id), 0)).scalar()
+            return
+
+        floor: int = max(highest - self.overlap, 0)
+
+        rows: List[Row[Tuple[int, str, str, int, int]]] = db.session.query(
+            DataChange.id,
+            DataChange.origin,
+            DataChange.table_name,
+            DataChange.row_id,
+            DataChange.election_id
+        ).filter(DataChange.id > floor).order_by(DataChange.id).all()
+
+        origin: str = self.origin
+        changes: List[Change] = []
+
+        with self._lock:
+            for change_id, change_origin, table_name, row_id, election_id in rows:
+                if change_id in self._handled:
+                    continue
+
+                self._handled.add(change_id)
+
+                if change_origin != origin:
+                    changes.append(Change(table_name, row_id, election_id))
+
+            highest = max(highest, rows[-1][0]) if rows else highest
+            self._highest = highest
+
+            # Ids that can no longer be read again are forgotten
+            self._handled = {change_id for change_id in self._handled if change_id > highest - self.overlap}
+
+        self.dispatch(changes)
+
+    def dispatch(self, changes: Iterable[Change]) -> None:
+        """
+        Hands changes to the listeners of their tables, each listener is called once.
+
+        `sync` calls it with the changes of other workers, and the session hooks
+        in Engine/cache_hooks.py with the ones this worker committed.
+
+        Args:
+            changes (Iterable[Change]): The committed changes.
+        """
+        listeners: Dict[Listener, List[Change]] = {}
+
+        for change in changes:
+            for listener in self._listeners.get(change.table_name, ()):
+                listeners.setdefault(listener, []).append(change)
+
+        for listener, listener_changes in listeners.items():
+            listener(listener_changes)
+
+    def prune(self) -> None:
+        """
+        Deletes the change rows older than the retention.
+        """
+        from Engine.models import DataChange
+        from Engine import db
+
+        DataChange.query.filter(DataChange.created_at < datetime.now() - timedelta(seconds=self.retention)).delete()
+        db.session.commit()
+
+    def _poll(self, app: Flask) -> None:
+        """
+        Syncs every `interval` seconds and prunes once a minute, for as long as the process runs.
+        """
+        from Engine import db, socketio
+
+        while True:
+            socketio.sleep(self.interval)
+
+            with app.app_context():
+                try:
+                    self.sync()
+
+                    if time.monotonic() >= self._next_prune:
+                        self._next_prune = time.monotonic() + 60
+                        self.prune()
+                except Exception:
+                    app.logger.exception('Could not sync the cached data')
+                finally:
+                    db.session.remove()
+
+data_version: DataVersion = DataVersion()
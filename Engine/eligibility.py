@@ -0,0 +1,391 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from Engine.data_version import Change
+from sqlalchemy import Row
+from datetime import datetime
+import threading
+
+Rule = Tuple[Optional[int], Optional[int]]
+
+class BallotRejected(Exception):
+    """
+    Raised when a ballot fails validation, the message is shown to the voter.
+    """
+
+class _OpenElection:
+    """
+    What the index keeps about an election open for voting.
+
+    Attributes:
+        slot: The bit of this election in every voter's eligibility bitset.
+        start: The datetime voting starts.
+        end: The datetime voting ends.
+        candidate_positions: Position id per candidate id of the election.
+        voted: Has-voted bitmap, bit `voter_id` is set once that voter's ballot is accepted.
+    """
+    __slots__ = ('slot', 'start', 'end', 'candidate_positions', 'voted')
+
+    def __init__(self, slot: int, start: datetime, end: datetime, candidate_positions: Dict[int, int]) -> None:
+        self.slot: int = slot
+        self.start: datetime = start
+        self.end: datetime = end
+        self.candidate_positions: Dict[int, int] = candidate_positions
+        self.voted: bytearray = bytearray()
+
+    def has_voted(self, voter_id: int) -> bool:
+        byte, bit = divmod(voter_id, 8)
+        return byte < len(self.voted) and bool(self.voted[byte] >> bit & 1)
+
+    def set_voted(self, voter_id: int, voted: bool = True) -> None:
+        byte, bit = divmod(voter_id, 8)
+
+        if byte >= len(self.voted):
+            self.voted.extend(bytes(byte - len(self.voted) + 1))
+
+        if voted:
+            self.voted[byte] |= 1 << bit
+        else:
+            self.voted[byte] &= ~(1 << bit) & 0xFF
+
+class EligibilityIndex:
+    """
+    In-memory index answering every ballot check without reading the database.
+
+    Each open election takes one bit in a per-voter eligibility bitset and owns a
+    has-voted bitmap indexed by voter id. An election is loaded from the database
+    the first time a ballot is cast in it, which also rebuilds its has-voted
+    bitmap from the stored votes after a restart.
+
+    Commits made by other workers reach the index through `apply_changes`, which
+    `data_version` calls off the request path: changed voters are read again and
+    changed elections are reloaded on their next ballot. A voter whose ballots
+    reach two workers at once passes both indexes, the unique constraint on
+    ballots then rejects the second one.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an EligibilityIndex instance.
+        """
+        self._lock: threading.Lock = threading.Lock()
+        self._voters: Optional[Dict[str, Tuple[int, int]]] = None
+        self._voter_groups: Dict[int, Rule] = {}
+        self._id_numbers: Dict[int, str] = {}
+        self._rules: Dict[int, List[Rule]] = {}
+        self._elections: Dict[int, _OpenElection] = {}
+
+    @staticmethod
+    def _matches(rules: List[Rule], group: Rule) -> bool:
+        """
+        Returns whether a voter's (course id, organization id) satisfies an election's rules.
+        """
+        if not rules:
+            return True
+
+        course_id, organization_id = group
+
+        return any(
+            (rule_course is None or rule_course == course_id) and
+            (rule_organization is None or rule_organization == organization_id)
+            for rule_course, rule_organization in rules
+        )
+
+    def _load_voters(self) -> None:
+        """
+        Reads every voter's id number, course and organization once.
+        Must be called with the lock held.
+        """
+        from Engine.models import Voter
+        from Engine import db
+
+        self._voters = {}
+
+        for voter_id, id_number, course_id, organization_id in db.session.query(
+            Voter.id, Voter.id_number, Voter.course_id, Voter.organization_id
+        ):
+            self._voter_groups[voter_id] = (course_id, organization_id)
+
+            if id_number:
+                self._voters[id_number] = (voter_id, 0)
+                self._id_numbers[voter_id] = id_number
+
+    def _free_slot(self) -> int:
+        """
+        Returns the lowest eligibility bit no open election uses.
+        """
+        used: Set[int] = {election.slot for election in self._elections.values()}
+        return next(slot for slot in range(len(used) + 1) if slot not in used)
+
+    def open_election(self, election_id: int) -> None:
+        """
+        Loads an election's rules, candidates and already accepted ballots and
+        sets its bit for every eligible voter.
+
+        Args:
+            election_id (int): The election to open.
+
+        Raises:
+            BallotRejected: If the election does not exist.
+        """
+        if election_id in self._elections:
+            return
+
+        from Engine.models import Ballot, Candidate, Election, ElectionEligibility, RankedVote, Vote
+        from Engine import db
+
+        with self._lock:
+            if election_id in self._elections:
+                return
+
+            election: Optional[Row[Tuple[datetime, datetime]]] = db.session.query(
+                Election.start_date_and_time, Election.end_date_and_time
+            ).filter_by(id=election_id).first()
+
+            if election is None:
+                raise BallotRejected("Election not found")
+
+            start, end = election
+
+            if self._voters is None:
+                self._load_voters()
+
+            rules: List[Rule] = [
+                (course_id, organization_id)
+                for course_id, organization_id in db.session.query(
+                    ElectionEligibility.course_id, ElectionEligibility.organization_id
+                ).filter_by(election_id=election_id)
+            ]
+
+            candidate_positions: Dict[int, int] = {
+                candidate_id: position_id
+                for candidate_id, position_id in db.session.query(
+                    Candidate.id, Candidate.position_id
+                ).filter_by(election_id=election_id)
+            }
+
+            opened: _OpenElection = _OpenElection(self._free_slot(), start, end, candidate_positions)
+
+            for model in (Ballot, Vote, RankedVote):
+                for (voter_id,) in db.session.query(model.voter_id).filter_by(election_id=election_id).distinct():
+                    if voter_id is not None:
+                        opened.set_voted(voter_id)
+
+            bit: int = 1 << opened.slot
+            voters: Dict[str, Tuple[int, int]] = self._voters or {}
+
+            for id_number, (voter_id, bits) in voters.items():
+                eligible: bool = self._matches(rules, self._voter_groups[voter_id])
+                voters[id_number] = (voter_id, bits | bit if eligible else bits & ~bit)
+
+            self._rules[election_id] = rules
+            self._elections[election_id] = opened
+
+    def close_election(self, election_id: int) -> None:
+        """
+        Forgets an election so its bit can be reused, it is reloaded on its next ballot.
+
+        Args:
+            election_id (int): The election to close.
+        """
+        with self._lock:
+            self._elections.pop(election_id, None)
+            self._rules.pop(election_id, None)
+
+    def add_voter(self, voter_id: int, id_number: Optional[str], course_id: Optional[int], organization_id: Optional[int]) -> None:
+        """
+        Adds or updates a voter committed after the index was loaded.
+
+        Args:
+            voter_id (int): The voter's primary key.
+            id_number (Optional[str]): The id number the voter casts ballots with.
+            course_id (Optional[int]): The voter's course.
+            organization_id (Optional[int]): The voter's organization.
+        """
+        with self._lock:
+            if self._voters is None:
+                return
+
+            group: Rule = (course_id, organization_id)
+            self._voter_groups[voter_id] = group
+
+            stale_id_number: Optional[str] = self._id_numbers.pop(voter_id, None)
+
+            if stale_id_number is not None:
+                self._voters.pop(stale_id_number, None)
+
+            if not id_number:
+                return
+
+            bits: int = 0
+
+            for election_id, election in self._elections.items():
+                if self._matches(self._rules[election_id], group):
+                    bits |= 1 << election.slot
+
+            self._voters[id_number] = (voter_id, bits)
+            self._id_numbers[voter_id] = id_number
+
+    def remove_voter(self, voter_id: int) -> None:
+        """
+        Forgets a deleted voter.
+
+        Args:
+            voter_id (int): The voter's primary key.
+        """
+        with self._lock:
+            self._voter_groups.pop(voter_id, None)
+            id_number: Optional[str] = self._id_numbers.pop(voter_id, None)
+
+            if id_number is not None and self._voters is not None:
+                self._voters.pop(id_number, None)
+
+    def reload_voters(self, voter_ids: Iterable[int]) -> None:
+        """
+        Reads changed voters again, the ones no longer stored are forgotten.
+
+        Reads through a connection of its own, the session cannot run queries
+        in the after_commit hook that hands it this worker's changes.
+
+        Args:
+            voter_ids (Iterable[int]): The changed voters.
+        """
+        from Engine.models import Voter
+        from sqlalchemy import select
+        from Engine import db
+
+        missing: Set[int] = set(voter_ids)
+
+        if self._voters is None or not missing:
+            return
+
+        with db.engine.connect() as connection:
+            voters: List[Row[Tuple[int, Optional[str], Optional[int], Optional[int]]]] = list(connection.execute(
+                select(Voter.id, Voter.id_number, Voter.course_id, Voter.organization_id).where(Voter.id.in_(missing))
+            ))
+
+        for voter_id, id_number, course_id, organization_id in voters:
+            self.add_voter(voter_id, id_number, course_id, organization_id)
+            missing.discard(voter_id)
+
+        for voter_id in missing:
+            self.remove_voter(voter_id)
+
+    def apply_changes(self, changes: List[Change]) -> None:
+        """
+        Updates the index with the committed voters, elections, candidates and rules.
+
+        Args:
+            changes (List[Change]): The changes, see Engine/data_version.py.
+        """
+        self.reload_voters({change.row_id for change in changes if change.table_name == 'voters' and change.row_id is not None})
+
+        for election_id in {change.election_id for change in changes if change.election_id is not None}:
+            self.close_election(election_id)
+
+    def validate_candidates(self, election_id: int, candidate_ids: Iterable[int]) -> None:
+        """
+        Checks that every candidate belongs to the election and that no position is voted twice.
+
+        Args:
+            election_id (int): The election the ballot is cast in.
+            candidate_ids (Iterable[int]): The chosen candidates.
+
+        Raises:
+            BallotRejected: If the ballot is empty or a candidate is invalid.
+        """
+        self.open_election(election_id)
+        election: Optional[_OpenElection] = self._elections.get(election_id)
+
+        if election is None:
+            raise BallotRejected("Election is not open")
+
+        candidate_positions: Dict[int, int] = election.candidate_positions
+        positions: Set[int] = set()
+        count: int = 0
+
+        for candidate_id in candidate_ids:
+            position_id: Optional[int] = candidate_positions.get(candidate_id)
+
+            if position_id is None:
+                raise BallotRejected("Candidate is not running in this election")
+
+            if position_id in positions:
+                raise BallotRejected("Only one candidate can be voted per position")
+
+            positions.add(position_id)
+            count += 1
+
+        if not count:
+            raise BallotRejected("Ballot has no candidates")
+
+    def accept(self, election_id: int, id_number: str, now: Optional[datetime] = None) -> int:
+        """
+        Checks that a voter exists, is eligible and has not voted yet, then marks them as voted.
+
+        The check and the mark happen under one lock so two ballots from the same
+        voter can never both be accepted. Call `release` if storing the ballot fails.
+
+        Args:
+            election_id (int): The election the ballot is cast in.
+            id_number (str): The id number the voter entered.
+            now (Optional[datetime]): The time of the ballot, defaults to now.
+
+        Returns:
+            int: The voter's id.
+
+        Raises:
+            BallotRejected: If the ballot must not be counted.
+        """
+        self.open_election(election_id)
+        now = now or datetime.now()
+
+        with self._lock:
+            election: Optional[_OpenElection] = self._elections.get(election_id)
+
+            if election is None:
+                raise BallotRejected("Election is not open")
+
+            if not election.start <= now <= election.end:
+                raise BallotRejected("Election is not open for voting")
+
+            voter: Optional[Tuple[int, int]] = (self._voters or {}).get(id_number)
+
+            if voter is None:
+                raise BallotRejected("ID number is not registered")
+
+            voter_id, bits = voter
+
+            if not bits >> election.slot & 1:
+                raise BallotRejected("Not eligible to vote in this election")
+
+            if election.has_voted(voter_id):
+                raise BallotRejected("Already voted in this election")
+
+            election.set_voted(voter_id)
+            return voter_id
+
+    def release(self, election_id: int, voter_id: int) -> None:
+        """
+        Clears the has-voted bit of a ballot that could not be stored.
+
+        Args:
+            election_id (int): The election the ballot was cast in.
+            voter_id (int): The voter returned by accept.
+        """
+        with self._lock:
+            election: Optional[_OpenElection] = self._elections.get(election_id)
+
+            if election is not None:
+                election.set_voted(voter_id, False)
+
+    def clear(self) -> None:
+        """
+        Forgets everything, the index is rebuilt from the database on the next ballot.
+        """
+        with self._lock:
+            self._voters = None
+            self._voter_groups.clear()
+            self._id_numbers.clear()
+            self._rules.clear()
+            self._elections.clear()
+
+eligibility_index: EligibilityIndex = EligibilityIndex()
@@ -0,0 +1,198 @@
+from flask import Blueprint, Response, abort, redirect, request, stream_with_context, url_for
+from werkzeug.wrappers.response import Response as RedirectResponse
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+from flask_login import current_user # type: ignore
+from Engine.models import Candidate, Election, Position, Vote, Voter
+from sqlalchemy import func
+from Engine import db
+import json
+import zlib
+import csv
+import io
+
+export: Blueprint = Blueprint('export', __name__, url_prefix='/admin/export')
+
+CHUNK_SIZE: int = 1000
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+VOTE_COLUMNS: List[str] = [
+    'vote_id', 'voted_at', 'election', 'position', 'candidate', 'candidate_id_number',
+    'voter_id_number', 'voter_first_name', 'voter_last_name'
+]
+
+RESULT_COLUMNS: List[str] = ['election', 'position', 'candidate', 'candidate_id_number', 'votes']
+
+def _csv_chunks(columns: List[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """
+    Writes rows as CSV, yielding the text of every CHUNK_SIZE rows.
+    """
+    buffer: io.StringIO = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+
+        if count % CHUNK_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode()
+
+def _ndjson_chunks(columns: List[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """
+    Writes rows as one JSON object per line, yielding every CHUNK_SIZE rows.
+    """
+    lines: List[str] = []
+
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, row)), default=str))
+
+        if len(lines) == CHUNK_SIZE:
+            yield ('\n'.join(lines) + '\n').encode()
+            lines.clear()
+
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode()
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Compresses a byte stream into a gzip file as it is produced.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    for chunk in chunks:
+        compressed: bytes = compressor.compress(chunk)
+
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
+
+def _stream(name: str, file_format: str, columns: List[str], rows: Iterable[Sequence[Any]]) -> Response:
+    """
+    Builds a streamed download of rows in the requested format.
+
+    Args:
+        name (str): The download file name without extension.
+        file_format (str): 'csv' or 'ndjson'.
+        columns (List[str]): The column names of the rows.
+        rows: The rows, consumed lazily while the response is sent.
+
+    Returns:
+        Response: The streamed response, gzip compressed when ?gzip=1 is given.
+    """
+    if file_format not in FORMATS:
+        abort(404)
+
+    writer: Callable = _csv_chunks if file_format == 'csv' else _ndjson_chunks
+    chunks: Iterator[bytes] = writer(columns, rows)
+    filename: str = f"{name}.{file_format}"
+    mimetype: str = FORMATS[file_format]
+
+    if request.args.get('gzip') in ('1', 'true'):
+        chunks = _gzip_chunks(chunks)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@export.before_request
+def require_admin() -> Optional[RedirectResponse]:
+    """
+    Redirects anyone who is not logged in as an admin to the login page.
+    """
+    if not current_user.is_authenticated:
+        return redirect(url_for('app_admin.login_form'))
+
+    return None
+
+@export.get("/votes.<file_format>")
+def votes(file_format: str) -> Response:
+    """
+    Streams every vote joined with its voter, candidate, position and election.
+
+    Rows are fetched CHUNK_SIZE at a time from a server side cursor so memory
+    stays flat however many votes are exported.
+
+    Query parameters:
+        election_id: Only export the votes of this election.
+        gzip: 1 to download a gzip compressed file.
+
+    Returns:
+        Response: A streamed CSV or NDJSON download.
+    """
+    query = db.session.query(
+        Vote.id,
+        Vote.created_at,
+        Election.title,
+        Position.name,
+        Candidate.name,
+        Candidate.id_number,
+        Voter.id_number,
+        Voter.first_name,
+        Voter.last_name
+    ).join(
+        Candidate, Candidate.id == Vote.candidate_id
+    ).join(
+        Position, Position.id == Candidate.position_id
+    ).join(
+        Election, Election.id == Vote.election_id
+    ).outerjoin(
+        Voter, Voter.id == Vote.voter_id
+    )
+
+    election_id: Optional[int] = request.args.get('election_id', type=int)
+
+    if election_id is not None:
+        query = query.filter(Vote.election_id == election_id)
+
+    return _stream('votes', file_format, VOTE_COLUMNS, query.order_by(Vote.id).yield_per(CHUNK_SIZE))
+
+@export.get("/results.<file_format>")
+def results(file_format: str) -> Response:
+    """
+    Streams the vote count of every candidate, grouped by election and position.
+
+    Query parameters:
+        election_id: Only export the results of this election.
+        gzip: 1 to download a gzip compressed file.
+
+    Returns:
+        Response: A streamed CSV or NDJSON download.
+    """
+    vote_count = func.count(Vote.id)
+
+    query = db.session.query(
+        Election.title,
+        Position.name,
+        Candidate.name,
+        Candidate.id_number,
+        vote_count
+    ).select_from(Candidate).join(
+        Election, Election.id == Candidate.election_id
+    ).join(
+        Position, Position.id == Candidate.position_id
+    ).outerjoin(
+        Vote, (Vote.candidate_id == Candidate.id) & (Vote.election_id == Candidate.election_id)
+    ).group_by(
+        Election.id, Election.title, Position.id, Position.name, Candidate.id, Candidate.name, Candidate.id_number
+    )
+
+    election_id: Optional[int] = request.args.get('election_id', type=int)
+
+    if election_id is not None:
+        query = query.filter(Candidate.election_id == election_id)
+
+    query = query.order_by(Election.id, Position.id, vote_count.desc())
+
+    return _stream('results', file_format, RESULT_COLUMNS, query.yield_per(CHUNK_SIZE))
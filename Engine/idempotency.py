@@ -0,0 +1,280 @@
+from flask import Flask, Response, g, make_response, request
+from typing import Callable, List, Optional, Tuple
+from flask_login import current_user # type: ignore
+from collections import OrderedDict
+from functools import wraps
+import threading
+import hashlib
+import time
+
+IDEMPOTENCY_HEADER: str = 'Idempotency-Key'
+IDEMPOTENCY_FIELD: str = 'idempotency_key'
+
+# Headers that belong to the client that made the first request, never replayed
+PRIVATE_HEADERS: Tuple[str, ...] = ('Set-Cookie',)
+
+class _Entry:
+    """
+    A single idempotency slot.
+
+    Attributes:
+        expires_at: Monotonic time after which the slot is evicted.
+        fingerprint: Hash of the submitted data of the first request.
+        done: Set once the first request finished or gave up the slot.
+        response: The stored (body, status, headers) of the first response.
+    """
+    __slots__ = ('expires_at', 'fingerprint', 'done', 'response')
+
+    def __init__(self, expires_at: float, fingerprint: str = '') -> None:
+        self.expires_at: float = expires_at
+        self.fingerprint: str = fingerprint
+        self.done: threading.Event = threading.Event()
+        self.response: Optional[Tuple[bytes, int, List[Tuple[str, str]]]] = None
+
+class IdempotencyStore:
+    """
+    Bounded, TTL-evicted store of first responses keyed by a client supplied token.
+
+    Duplicates of a request that already finished get the stored response replayed.
+    Duplicates that arrive while the first request is still running wait for it
+    instead of running the view a second time.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 600, wait_timeout: float = 30) -> None:
+        """
+        Initialize an IdempotencyStore instance.
+
+        Args:
+            max_entries (int): The most keys kept before the oldest are evicted.
+            ttl (float): Seconds a key is remembered.
+            wait_timeout (float): Seconds a duplicate waits for the first request to finish.
+        """
+        self.max_entries: int = max_entries
+        self.ttl: float = ttl
+        self.wait_timeout: float = wait_timeout
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Reads the store limits from the application config.
+
+        Args:
+            app (Flask): The application being configured.
+        """
+        self.max_entries = app.config.get('IDEMPOTENCY_MAX_ENTRIES', self.max_entries)
+        self.ttl = app.config.get('IDEMPOTENCY_TTL', self.ttl)
+        self.wait_timeout = app.config.get('IDEMPOTENCY_WAIT_TIMEOUT', self.wait_timeout)
+
+    def _evict(self, now: float) -> None:
+        """
+        Drops expired keys, then the oldest keys while the store is over its bound.
+        Keys whose first request is still running are kept, otherwise a waiting
+        duplicate would claim the key again and run the view a second time.
+        Must be called with the lock held.
+        """
+        stale: List[str] = []
+        overflow: int = len(self._entries) - self.max_entries
+
+        # Every entry shares the same ttl so insertion order is also expiry order
+        for key, entry in self._entries.items():
+            if entry.expires_at > now and overflow <= 0:
+                break
+
+            if entry.done.is_set():
+                stale.append(key)
+                overflow -= 1
+
+        for key in stale:
+            del self._entries[key]
+
+    def claim(self, key: str, fingerprint: str = '') -> Tuple[_Entry, bool]:
+        """
+        Returns the slot for a key, creating it if it does not exist yet.
+
+        Args:
+            key (str): The scoped idempotency key.
+            fingerprint (str): Hash of the submitted data, stored with a new slot.
+
+        Returns:
+            Tuple[_Entry, bool]: The slot and whether the caller created it and must fill it.
+        """
+        now: float = time.monotonic()
+
+        with self._lock:
+            entry: Optional[_Entry] = self._entries.get(key)
+
+            if entry is not None and (entry.expires_at > now or not entry.done.is_set()):
+                return entry, False
+
+            entry = _Entry(now + self.ttl, fingerprint)
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            self._evict(now)
+
+            return entry, True
+
+    def release(self, key: str, entry: _Entry) -> None:
+        """
+        Gives up a slot without storing a response so the next retry runs the view again.
+
+        Args:
+            key (str): The scoped idempotency key.
+            entry (_Entry): The slot returned by claim.
+        """
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+        entry.done.set()
+
+    def clear(self) -> None:
+        """
+        Forgets every stored key.
+        """
+        with self._lock:
+            entries: List[_Entry] = list(self._entries.values())
+            self._entries.clear()
+
+        for entry in entries:
+            entry.done.set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+idempotency_store: IdempotencyStore = IdempotencyStore()
+
+def _request_key() -> Optional[str]:
+    """
+    Builds the store key for the current request.
+
+    The client token is scoped to the path, which includes ids such as the
+    election a ballot is cast in, and to the logged in user.
+
+    Returns:
+        Optional[str]: The scoped key, or None if the client sent no token.
+    """
+    token: Optional[str] = request.headers.get(IDEMPOTENCY_HEADER) or request.form.get(IDEMPOTENCY_FIELD)
+
+    if not token:
+        return None
+
+    user_id: str = (current_user.get_id() or '') if current_user else ''
+    return f"{request.path}:{user_id}:{token[:128]}"
+
+def _request_fingerprint() -> str:
+    """
+    Hashes the data submitted with the current request.
+
+    Form fields and uploaded files are hashed once parsed, so a browser resending
+    the same form with a new multipart boundary still matches. Anything else is
+    hashed as the raw body.
+
+    Returns:
+        str: The hex digest of the submitted data.
+    """
+    digest = hashlib.sha256()
+
+    if not request.form and not request.files:
+        digest.update(request.get_data())
+        return digest.hexdigest()
+
+    for name, value in sorted(request.form.items(multi=True)):
+        if name != IDEMPOTENCY_FIELD:
+            digest.update(f"{len(name)}:{name}{len(value)}:{value}".encode())
+
+    for name, file in sorted(request.files.items(multi=True), key=lambda item: (item[0], item[1].filename or '')):
+        digest.update(f"{len(name)}:{name}{file.filename}".encode())
+        digest.update(hashlib.sha256(file.stream.read()).digest())
+        file.stream.seek(0)
+
+    return digest.hexdigest()
+
+def mark_completed() -> None:
+    """
+    Marks the current request as having done its work, its response is then stored
+    and replayed to duplicates. Views call it once their changes are committed.
+
+    >>> db.session.commit()
+    >>> mark_completed()
+    """
+    g.idempotency_completed = True
+
+def _replay(stored: Tuple[bytes, int, List[Tuple[str, str]]]) -> Response:
+    """
+    Rebuilds a stored response.
+    """
+    body, status, headers = stored
+    response: Response = Response(body, status=status, headers=headers)
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+def idempotent(view: Callable) -> Callable:
+    """
+    Makes a POST view replay its first response for requests that repeat the same
+    `Idempotency-Key` header or `idempotency_key` form field.
+
+    A key sent again with different data, such as another voter's ballot, is
+    rejected with a 422 instead of being replayed.
+
+    Only responses of requests that called `mark_completed` are stored. Anything
+    else, such as a re-rendered invalid form, a rejection that may pass later, a
+    5xx status, a streamed response or a view that raised, releases the key so
+    the client's next retry runs the view again.
+
+    >>> @app.post("/vote")
+    >>> @idempotent
+    >>> def vote():
+    >>>     ...
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method != 'POST':
+            return view(*args, **kwargs)
+
+        key: Optional[str] = _request_key()
+
+        if key is None:
+            return view(*args, **kwargs)
+
+        fingerprint: str = _request_fingerprint()
+
+        while True:
+            entry, owner = idempotency_store.claim(key, fingerprint)
+
+            if owner:
+                break
+
+            if entry.fingerprint != fingerprint:
+                return make_response(('Idempotency key was already used for a different request', 422))
+
+            if not entry.done.wait(idempotency_store.wait_timeout):
+                return make_response(('Request with this idempotency key is still in progress', 409))
+
+            if entry.response is not None:
+                return _replay(entry.response)
+
+        g.pop('idempotency_completed', None)
+
+        try:
+            response: Response = make_response(view(*args, **kwargs))
+        except BaseException:
+            idempotency_store.release(key, entry)
+            raise
+
+        completed: bool = g.pop('idempotency_completed', False)
+
+        if not completed or response.status_code >= 500 or response.is_streamed:
+            idempotency_store.release(key, entry)
+            return response
+
+        headers: List[Tuple[str, str]] = [
+            (name, value) for name, value in response.headers.items() if name not in PRIVATE_HEADERS
+        ]
+
+        entry.response = (response.get_data(), response.status_code, headers)
+        entry.done.set()
+
+        return response
+
+    return wrapper
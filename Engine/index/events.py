@@ -0,0 +1,176 @@
+from Engine.socket_queue import WORKER_NAMESPACE, on_worker_message
+from flask_socketio import emit, join_room # type: ignore
+from Engine.cache_hooks import ELECTION_GRAPH_TABLES
+from Engine.read_models import election_read_model
+from Engine.data_version import Change, data_version
+from Engine.leaderboard import leaderboard
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from Engine.models import Vote
+from sqlalchemy.orm import Session
+from Engine import db, socketio
+from sqlalchemy import event
+from flask import Flask
+
+VOTES_EVENT: str = 'votes'
+PENDING_VOTES_KEY: str = 'leaderboard_pending_votes'
+ELECTION_ROOM_PREFIX: str = 'election:'
+
+def election_room(election_id: int) -> str:
+    """
+    Returns the Socket.IO room of the clients following an election.
+
+    Rooms only live in the worker holding the connection, a reconnecting
+    client rejoins by asking for the leaderboard again.
+    """
+    return f'{ELECTION_ROOM_PREFIX}{election_id}'
+
+def followed_elections(election_ids: Optional[Iterable[int]] = None) -> List[int]:
+    """
+    Returns the elections that clients connected to this worker follow.
+
+    Args:
+        election_ids: Only check these elections, every election when omitted.
+    """
+    rooms: Dict[Any, Any] = socketio.server.manager.rooms.get('/', {})
+
+    if election_ids is None:
+        election_ids = [
+            int(room[len(ELECTION_ROOM_PREFIX):])
+            for room in rooms
+            if isinstance(room, str) and room.startswith(ELECTION_ROOM_PREFIX)
+        ]
+
+    return [election_id for election_id in election_ids if rooms.get(election_room(election_id))]
+
+def reload_leaderboards(election_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Reloads the dropped leaderboards that clients of this worker follow and sends them
+    the fresh ones, on a background task so ballots and queue handlers never wait on it.
+
+    Args:
+        election_ids: The elections whose leaderboard was dropped, every election when omitted.
+    """
+    followed: List[int] = followed_elections(election_ids)
+
+    if followed and leaderboard.app is not None:
+        socketio.start_background_task(send_leaderboards, leaderboard.app, followed)
+
+def send_leaderboards(app: Flask, election_ids: List[int]) -> None:
+    """
+    Loads the leaderboards of some elections and emits them to their rooms.
+    """
+    with app.app_context():
+        try:
+            for election_id in election_ids:
+                payload: Optional[Dict[str, Any]] = leaderboard.get(election_id)
+
+                if payload is not None:
+                    socketio.emit('highest_rated_candidate', payload, to=election_room(election_id), ignore_queue=True)
+        except Exception:
+            app.logger.exception('Could not reload the leaderboards')
+        finally:
+            db.session.remove()
+
+def reload_changed_leaderboards(changes: List[Change]) -> None:
+    """
+    Sends fresh leaderboards to the followers of the elections whose graph changed,
+    after Engine/cache_hooks.py dropped them.
+    """
+    if any(change.table_name == 'positions' for change in changes):
+        reload_leaderboards()
+    else:
+        reload_leaderboards({change.election_id for change in changes if change.election_id is not None})
+
+data_version.subscribe(ELECTION_GRAPH_TABLES, reload_changed_leaderboards)
+
+@socketio.on('get_highest_rated_candidate')
+def get_highest_rated_candidate(data: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Sends the requesting client the top candidates of every position of an election
+    and subscribes it to that election's updates.
+
+    Args:
+        data: Optional {'election_id': int}, defaults to the most recently created election.
+    """
+    if data is not None and not isinstance(data, dict):
+        return
+
+    election_id: Any = (data or {}).get('election_id')
+
+    if election_id is None:
+        election_id = election_read_model.newest_id()
+
+        if election_id is None:
+            return
+
+    # Client supplied, anything but an existing election id is ignored
+    if not isinstance(election_id, int) or isinstance(election_id, bool):
+        return
+
+    payload: Optional[Dict[str, Any]] = leaderboard.get(election_id)
+
+    if payload is None:
+        return
+
+    join_room(election_room(election_id))
+    emit('highest_rated_candidate', payload)
+
+@event.listens_for(db.session, 'after_flush')
+def collect_votes(session: Session, flush_context: Any) -> None:
+    """
+    Remembers the votes inserted by this flush until the transaction commits.
+    """
+    votes: List[Tuple[int, int, int]] = [
+        (int(instance.election_id), int(instance.candidate_id), int(instance.id))
+        for instance in session.new
+        if isinstance(instance, Vote)
+    ]
+
+    if votes:
+        session.info.setdefault(PENDING_VOTES_KEY, []).extend(votes)
+
+@event.listens_for(db.session, 'after_commit')
+def publish_votes(session: Session) -> None:
+    """
+    Sends the committed votes to the leaderboards of every worker.
+    """
+    votes: List[Tuple[int, int, int]] = session.info.pop(PENDING_VOTES_KEY, [])
+
+    if votes:
+        socketio.emit(VOTES_EVENT, [list(vote) for vote in votes], namespace=WORKER_NAMESPACE)
+
+@on_worker_message(VOTES_EVENT)
+def count_votes(votes: List[List[int]]) -> None:
+    """
+    Counts votes committed by any worker and sends the elections whose ordering
+    changed to the clients this worker holds in their room.
+
+    Args:
+        votes: [election id, candidate id, vote id] per vote.
+    """
+    changed: Set[int] = set()
+    dropped: Set[int] = set()
+
+    for election_id, candidate_id, vote_id in votes:
+        if leaderboard.record_vote(election_id, candidate_id, vote_id):
+            changed.add(election_id)
+
+    for election_id in changed | {vote[0] for vote in votes}:
+        payload: Optional[Dict[str, Any]] = leaderboard.payload(election_id)
+
+        # Every worker emits to its own clients
+        if payload is None:
+            dropped.add(election_id)
+        elif election_id in changed:
+            socketio.emit('highest_rated_candidate', payload, to=election_room(election_id), ignore_queue=True)
+
+    # Boards dropped by an edit or an unknown candidate are loaded again with the vote
+    if dropped:
+        reload_leaderboards(dropped)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_votes(session: Session) -> None:
+    """
+    Forgets the votes of a transaction that was rolled back.
+    """
+    session.info.pop(PENDING_VOTES_KEY, None)
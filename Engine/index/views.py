@@ -1,6 +1,13 @@
-from flask import render_template, Blueprint
+from Engine.read_models import ElectionDTO, election_read_model
+from Engine.eligibility import BallotRejected, eligibility_index
+from flask import Blueprint, Response, abort, jsonify, request
+from Engine.templating import render_page
+from Engine.idempotency import idempotent, mark_completed
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from Engine import db
 
-from Engine.models import Election
+from Engine.models import Ballot, Vote
 
 index: Blueprint = Blueprint('index', __name__, template_folder='templates/index', static_folder='static/index')
 
@@ -9,10 +16,90 @@ def _index() -> str:
     """
     Load the root page.
 
+    In the production template mode only the elections list is rendered, the rest
+    of the page was prerendered at startup.
+
     Returns:
     --------
         render_template: Rendered HTML template with necessary data.
     """
-    elections = Election.query.order_by(Election.created_at.desc()).all()
-    return render_template("index.html", elections=elections)
+    elections: List[ElectionDTO] = election_read_model.all()
+    return render_page("index.html", "elections.html", elections=elections)
+
+@index.get("/election/<int:election_id>.json")
+def election_data(election_id: int) -> Response:
+    """
+    Returns an election with its positions and candidates.
+
+    Returns:
+        JSON response with the election, 404 if it does not exist
+    """
+    election: Optional[ElectionDTO] = election_read_model.get(election_id)
+
+    if election is None:
+        abort(404)
+
+    return jsonify(election.to_dict())
+
+
+@index.post("/election/<int:election_id>/ballot")
+@idempotent
+def cast_ballot(election_id: int) -> Response:
+    """
+    Casts a voter's ballot.
+
+    The voter, their eligibility, whether they already voted and the chosen
+    candidates are all checked against the eligibility index, so the only
+    database work is storing the ballot and its votes. The ballot's unique
+    constraint rejects a second ballot of a voter accepted by another worker,
+    any other failure lets the voter try again.
+
+    Form data:
+        id_number: The voter's id number.
+        candidate_id: One per chosen candidate, at most one per position.
+
+    Returns:
+        - JSON response with status=success if the ballot was stored
+        - JSON response with status=error and the reason if it was rejected
+    """
+    id_number: str = (request.form.get('id_number') or '').strip()
+    candidate_ids: List[int] = request.form.getlist('candidate_id', type=int)
+
+    try:
+        eligibility_index.validate_candidates(election_id, candidate_ids)
+        voter_id: int = eligibility_index.accept(election_id, id_number)
+    except BallotRejected as error:
+        return jsonify({
+            'status': 'error',
+            'message': [str(error)]
+        })
+
+    try:
+        db.session.add(Ballot(voter_id=voter_id, election_id=election_id))
+        db.session.add_all([
+            Vote(voter_id=voter_id, candidate_id=candidate_id, election_id=election_id)
+            for candidate_id in candidate_ids
+        ])
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+
+        # Another worker stored this voter's ballot first, their has-voted bit stays set
+        if db.session.query(Ballot.id).filter_by(election_id=election_id, voter_id=voter_id).first() is not None:
+            return jsonify({
+                'status': 'error',
+                'message': ["Already voted in this election"]
+            })
+
+        eligibility_index.release(election_id, voter_id)
+        raise
+    except Exception:
+        db.session.rollback()
+        eligibility_index.release(election_id, voter_id)
+        raise
+
+    mark_completed()
 
+    return jsonify({
+        'status': 'success'
+    })
@@ -0,0 +1,391 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from flask import Flask
+import threading
+
+if TYPE_CHECKING:
+    from Engine.read_models import CandidateDTO
+
+class PositionBoard:
+    """
+    The running vote counts and top-k candidates for one position of one election.
+
+    Attributes:
+        size: The number of candidates kept in the top list.
+        counts: Vote count per candidate id.
+        top: Candidate ids ordered by votes, highest first, at most `size` long.
+    """
+    __slots__ = ('size', 'counts', 'top')
+
+    def __init__(self, size: int, counts: Dict[int, int]) -> None:
+        """
+        Initialize a PositionBoard instance.
+
+        This is the only place the candidates are sorted, every vote after that
+        moves a single candidate within the top list.
+
+        Args:
+            size (int): The number of candidates kept in the top list.
+            counts (Dict[int, int]): The vote count per candidate id.
+        """
+        self.size: int = size
+        self.counts: Dict[int, int] = counts
+        self.top: List[int] = sorted(counts, key=lambda candidate_id: (-counts[candidate_id], candidate_id))[:size]
+
+    def add_vote(self, candidate_id: int) -> bool:
+        """
+        Counts one vote and repositions the candidate in the top list.
+
+        Counts only ever grow, so a candidate outside the top list can only enter
+        it by passing the last entry, and one inside can only move up. Ties are
+        ordered by the lower candidate id, like the initial sort, so a reloaded
+        board keeps the order clients already have.
+
+        Args:
+            candidate_id (int): The candidate that received the vote.
+
+        Returns:
+            bool: True if the members or the ordering of the top list changed.
+        """
+        counts: Dict[int, int] = self.counts
+        votes: int = counts.get(candidate_id, 0) + 1
+        counts[candidate_id] = votes
+        top: List[int] = self.top
+        rank: Tuple[int, int] = (-votes, candidate_id)
+        changed: bool = False
+
+        if candidate_id in top:
+            index: int = top.index(candidate_id)
+        elif len(top) < self.size:
+            top.append(candidate_id)
+            index = len(top) - 1
+            changed = True
+        elif top and rank < (-counts[top[-1]], top[-1]):
+            top[-1] = candidate_id
+            index = len(top) - 1
+            changed = True
+        else:
+            return False
+
+        while index > 0 and rank < (-counts[top[index - 1]], top[index - 1]):
+            top[index - 1], top[index] = top[index], top[index - 1]
+            index -= 1
+            changed = True
+
+        return changed
+
+class ElectionBoard:
+    """
+    The position boards of a single election and the payload served to clients.
+
+    Candidates in the payload are CandidateDTO.to_dict() with their vote count
+    added, the same shape /election/<id>.json uses.
+
+    Attributes:
+        election_id: The election the board belongs to.
+        candidates: The candidate read model per candidate id.
+        positions: The board of every position in the election.
+        payload: The cached, ready to emit leaderboard.
+        floor: Votes with an id up to this one are included in the loaded counts.
+        loaded_ids: The ids above `floor` of the votes included in the loaded counts.
+    """
+    __slots__ = ('election_id', 'candidates', 'positions', 'payload', 'floor', 'loaded_ids')
+
+    def __init__(
+        self,
+        election_id: int,
+        size: int,
+        candidates: Iterable[CandidateDTO],
+        counts: Dict[int, int],
+        floor: int = 0,
+        loaded_ids: FrozenSet[int] = frozenset()
+    ) -> None:
+        """
+        Initialize an ElectionBoard instance.
+
+        Args:
+            election_id (int): The election the board belongs to.
+            size (int): The number of candidates kept per position.
+            candidates (Iterable[CandidateDTO]): The candidates of the election.
+            counts (Dict[int, int]): The vote count per candidate id, missing candidates have none.
+            floor (int): Votes with an id up to this one are included in the counts.
+            loaded_ids (FrozenSet[int]): The ids above `floor` of the votes included in the counts.
+        """
+        self.election_id: int = election_id
+        self.floor: int = floor
+        self.loaded_ids: FrozenSet[int] = loaded_ids
+        self.candidates: Dict[int, CandidateDTO] = {}
+        position_counts: Dict[int, Dict[int, int]] = {}
+
+        for candidate in candidates:
+            self.candidates[candidate.id] = candidate
+            position_counts.setdefault(candidate.position.id, {})[candidate.id] = counts.get(candidate.id, 0)
+
+        self.positions: Dict[int, PositionBoard] = {
+            position_id: PositionBoard(size, candidate_counts) for position_id, candidate_counts in position_counts.items()
+        }
+
+        self.payload: Dict[str, Any] = {
+            'election_id': election_id,
+            'positions': {position_id: self._position_payload(position_id) for position_id in self.positions}
+        }
+
+    def loaded(self, vote_id: int) -> bool:
+        """
+        Returns whether a vote was already included when the board was loaded.
+        """
+        return vote_id <= self.floor or vote_id in self.loaded_ids
+
+    def _position_payload(self, position_id: int) -> List[Dict[str, Any]]:
+        """
+        Serializes the top list of a position.
+        """
+        board: PositionBoard = self.positions[position_id]
+
+        return [
+            {**self.candidates[candidate_id].to_dict(), 'votes': board.counts[candidate_id]}
+            for candidate_id in board.top
+        ]
+
+    def add_vote(self, candidate_id: int) -> Optional[bool]:
+        """
+        Counts one vote for a candidate of this election.
+
+        Args:
+            candidate_id (int): The candidate that received the vote.
+
+        Returns:
+            Optional[bool]: Whether the ordering changed, or None if the candidate is unknown to the board.
+        """
+        candidate: Optional[CandidateDTO] = self.candidates.get(candidate_id)
+
+        if candidate is None:
+            return None
+
+        position_id: int = candidate.position.id
+
+        board: PositionBoard = self.positions[position_id]
+        changed: bool = board.add_vote(candidate_id)
+
+        # Vote counts shown to clients are refreshed even when the order holds
+        if changed or candidate_id in board.top:
+            self.payload = {
+                'election_id': self.election_id,
+                'positions': {**self.payload['positions'], position_id: self._position_payload(position_id)}
+            }
+
+        return changed
+
+class Leaderboard:
+    """
+    In-memory top-k candidates per position per election.
+
+    An election is loaded from the database the first time it is asked for and is
+    then kept current by `record_vote`, so answering a client never sorts or
+    reads the database.
+
+    Every worker counts the votes of every worker: committed votes are sent to
+    all of them through the Socket.IO message queue, see Engine/index/events.py.
+    A vote can reach a worker after the board was loaded with it already
+    counted, so a board remembers the ids of the newest votes it loaded and
+    skips those.
+    """
+
+    def __init__(self, size: int = 3, overlap: int = 1024) -> None:
+        """
+        Initialize a Leaderboard instance.
+
+        Args:
+            size (int): The number of candidates kept per position.
+            overlap (int): The number of newest vote ids a loaded board remembers.
+        """
+        self.size: int = size
+        self.overlap: int = overlap
+        self.app: Optional[Flask] = None
+        self._elections: Dict[int, ElectionBoard] = {}
+        self._loading: Dict[int, List[List[Tuple[int, int]]]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Reads the leaderboard size from the application config and keeps the
+        application boards are reloaded with off the request path.
+
+        Args:
+            app (Flask): The application being configured.
+        """
+        self.app = app
+        self.size = app.config.get('LEADERBOARD_SIZE', self.size)
+        self.overlap = app.config.get('LEADERBOARD_LOAD_OVERLAP', self.overlap)
+        self.invalidate()
+
+    def _load(self, election_id: int) -> Optional[ElectionBoard]:
+        """
+        Builds the board of an election from its read model and vote counts,
+        None if the election does not exist.
+
+        The counts and the newest vote ids are read in their own transaction, which
+        starts after the caller began buffering votes, so every vote is either in
+        the counts or in the buffer. Both walk the (election_id, id) index.
+        """
+        from Engine.read_models import ElectionDTO, election_read_model
+        from sqlalchemy import Connection, func, select
+        from Engine.models import Vote
+        from Engine import db
+
+        election: Optional[ElectionDTO] = election_read_model.get(election_id)
+
+        if election is None:
+            return None
+
+        connection: Connection
+
+        with db.engine.connect() as connection:
+            newest: List[int] = list(connection.scalars(
+                select(Vote.id).where(Vote.election_id == election_id).order_by(Vote.id.desc()).limit(self.overlap)
+            ))
+
+            counts: Dict[int, int] = {
+                candidate_id: votes
+                for candidate_id, votes in connection.execute(
+                    select(Vote.candidate_id, func.count(Vote.id)).where(Vote.election_id == election_id).group_by(Vote.candidate_id)
+                )
+            }
+
+        # Below the oldest remembered id every vote is assumed counted
+        floor: int = newest[-1] - 1 if len(newest) == self.overlap else 0
+
+        return ElectionBoard(
+            election_id,
+            self.size,
+            election.candidates,
+            counts,
+            floor,
+            frozenset(newest)
+        )
+
+    def _stop_buffering(self, election_id: int, pending: List[Tuple[int, int]]) -> None:
+        """
+        Stops collecting votes into a loader's buffer, must be called with the lock held.
+        """
+        buffers: List[List[Tuple[int, int]]] = self._loading[election_id]
+        buffers.remove(pending)
+
+        if not buffers:
+            del self._loading[election_id]
+
+    def _register(self, election_id: int) -> Optional[ElectionBoard]:
+        """
+        Loads an election and registers its board, elections that do not exist are not registered.
+
+        Votes counted while the election is loading are buffered, once the board
+        is registered the ones it did not load are added.
+        """
+        pending: List[Tuple[int, int]] = []
+
+        with self._lock:
+            self._loading.setdefault(election_id, []).append(pending)
+
+        try:
+            loaded: Optional[ElectionBoard] = self._load(election_id)
+        except BaseException:
+            with self._lock:
+                self._stop_buffering(election_id, pending)
+            raise
+
+        with self._lock:
+            self._stop_buffering(election_id, pending)
+            board: Optional[ElectionBoard] = self._elections.get(election_id)
+
+            if loaded is None:
+                return None
+
+            # Another loader registered first, its board already has these votes
+            if board is not None:
+                return board
+
+            self._elections[election_id] = loaded
+
+        for candidate_id, vote_id in pending:
+            self.record_vote(election_id, candidate_id, vote_id)
+
+        return loaded
+
+    def get(self, election_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Returns the leaderboard payload of an election.
+
+        Args:
+            election_id (int): The election to read.
+
+        Returns:
+            Optional[Dict[str, Any]]: The election id and the ordered top candidates of
+                                      each position, None if the election does not exist.
+        """
+        board: Optional[ElectionBoard] = self._elections.get(election_id)
+
+        if board is None:
+            board = self._register(election_id)
+
+        return board.payload if board is not None else None
+
+    def payload(self, election_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Returns the leaderboard payload of an election that is loaded, without loading it.
+
+        Args:
+            election_id (int): The election to read.
+
+        Returns:
+            Optional[Dict[str, Any]]: The payload, or None if nobody asked for the election.
+        """
+        board: Optional[ElectionBoard] = self._elections.get(election_id)
+        return board.payload if board is not None else None
+
+    def record_vote(self, election_id: int, candidate_id: int, vote_id: int) -> bool:
+        """
+        Counts a committed vote.
+
+        Elections that were never asked for are left alone since loading them
+        later already includes this vote. Votes the board loaded are skipped.
+
+        Args:
+            election_id (int): The election the vote was cast in.
+            candidate_id (int): The candidate that received the vote.
+            vote_id (int): The id of the committed Vote.
+
+        Returns:
+            bool: True if the leader or the ordering of the candidate's position changed.
+        """
+        with self._lock:
+            for pending in self._loading.get(election_id, ()):
+                pending.append((candidate_id, vote_id))
+
+            board: Optional[ElectionBoard] = self._elections.get(election_id)
+
+            if board is None or board.loaded(vote_id):
+                return False
+
+            changed: Optional[bool] = board.add_vote(candidate_id)
+
+            # A candidate added after the board was loaded, reload on next read
+            if changed is None:
+                del self._elections[election_id]
+                return False
+
+            return changed
+
+    def invalidate(self, election_id: Optional[int] = None) -> None:
+        """
+        Drops one election, or every election, so it is reloaded on the next read.
+
+        Args:
+            election_id (Optional[int]): The election to drop, all of them when omitted.
+        """
+        with self._lock:
+            if election_id is None:
+                self._elections.clear()
+            else:
+                self._elections.pop(election_id, None)
+
+leaderboard: Leaderboard = Leaderboard()
@@ -1,5 +1,5 @@
 from typing import List, Type
-from sqlalchemy import Column, Integer, DateTime as SQLAlchemyDateTime, ForeignKey, Text, String
+from sqlalchemy import Column, Integer, DateTime as SQLAlchemyDateTime, ForeignKey, Text, String, Index, UniqueConstraint
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
 from Engine import login_manager, db
@@ -163,6 +163,24 @@ class Election(BaseModel):
         self.start_date_and_time = start_date_and_time
         self.end_date_and_time = end_date_and_time
 
+class ElectionEligibility(BaseModel):
+    """
+    Restricts an election to the voters of a course, an organization, or both.
+
+    An election without any ElectionEligibility is open to every voter. Otherwise
+    a voter may vote if they match at least one of its rules.
+
+    Attributes:
+        election_id: The foreign key referencing the Election.
+        course_id: The optional foreign key referencing the Course a voter must belong to.
+        organization_id: The optional foreign key referencing the Organization a voter must belong to.
+    """
+    __tablename__ = 'election_eligibilities'
+
+    election_id = Column(Integer, ForeignKey('elections.id'), nullable=False, index=True)
+    course_id = Column(Integer, ForeignKey('courses.id'), nullable=True)
+    organization_id = Column(Integer, ForeignKey('organizations.id'), nullable=True)
+
 class Organization(BaseModel):
     """
     Represents an organization where a student belongs.
@@ -254,15 +272,82 @@ class Vote(BaseModel):
         election_id: The foreign key referencing the Election.
     """
     __tablename__ = 'Votes'
+    __table_args__ = (
+        # Leaderboards load an election's counts and newest vote ids through it
+        Index('ix_votes_election', 'election_id', 'id'),
+    )
 
     voter_id = Column(Integer, ForeignKey('voters.id'))
     candidate_id = Column(Integer, ForeignKey('candidates.id'))
     election_id = Column(Integer, ForeignKey('elections.id'))
 
+class RankedVote(BaseModel):
+    """
+    A single preference on a ranked-choice ballot, stored alongside Vote.
+
+    A voter's ballot for a position is every RankedVote sharing their voter_id,
+    election_id and position_id, ordered by rank (1 being the first choice).
+
+    Attributes:
+        voter_id: The foreign key referencing the Voter.
+        candidate_id: The foreign key referencing the ranked Candidate.
+        election_id: The foreign key referencing the Election.
+        position_id: The foreign key referencing the Position being voted on.
+        rank: The preference order of the candidate on the ballot.
+    """
+    __tablename__ = 'RankedVotes'
+    __table_args__ = (
+        UniqueConstraint('voter_id', 'election_id', 'position_id', 'rank'),
+        Index('ix_ranked_votes_ballot', 'election_id', 'position_id', 'voter_id', 'rank'),
+    )
+
+    voter_id = Column(Integer, ForeignKey('voters.id'), nullable=False)
+    candidate_id = Column(Integer, ForeignKey('candidates.id'), nullable=False)
+    election_id = Column(Integer, ForeignKey('elections.id'), nullable=False)
+    position_id = Column(Integer, ForeignKey('positions.id'), nullable=False)
+    rank = Column(Integer, nullable=False)
+
+class Ballot(BaseModel):
+    """
+    One accepted ballot per voter per election, stored with the ballot's Votes.
+
+    The unique constraint is the database's guard against a voter voting twice
+    when their ballots reach different workers.
+
+    Attributes:
+        voter_id: The foreign key referencing the Voter.
+        election_id: The foreign key referencing the Election.
+    """
+    __tablename__ = 'ballots'
+    __table_args__ = (
+        UniqueConstraint('election_id', 'voter_id'),
+    )
+
+    voter_id = Column(Integer, ForeignKey('voters.id'), nullable=False)
+    election_id = Column(Integer, ForeignKey('elections.id'), nullable=False)
+
+class DataChange(BaseModel):
+    """
+    A committed change to data that workers cache in memory, see Engine/data_version.py.
+
+    Attributes:
+        origin: The worker process that committed the change.
+        table_name: The table of the changed row.
+        row_id: The primary key of the changed row.
+        election_id: The election the changed row belongs to, if any.
+    """
+    __tablename__ = 'data_changes'
+
+    origin = Column(String(32), nullable=False)
+    table_name = Column(String(64), nullable=False)
+    row_id = Column(Integer, nullable=True)
+    election_id = Column(Integer, nullable=True)
+
 model_collection: List[Type[BaseModel]] = [
     User,
     Course,
     Election,
+    ElectionEligibility,
     Organization,
     Position,
     Candidate
@@ -0,0 +1,270 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
+from sqlalchemy.orm import selectinload
+from sqlalchemy import select
+from Engine.models import BaseModel, Candidate, Election
+from datetime import datetime
+from Engine import db
+import threading
+
+class PositionDTO:
+    """
+    Read-only view of a Position.
+    """
+    __slots__ = ('id', 'name')
+
+    def __init__(self, id: int, name: str) -> None:
+        self.id: int = id
+        self.name: str = name
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.id, 'name': self.name}
+
+class CandidateDTO:
+    """
+    Read-only view of a Candidate and its Position.
+    """
+    __slots__ = ('id', 'name', 'image_filename', 'id_number', 'position')
+
+    def __init__(self, id: int, name: str, image_filename: Optional[str], id_number: Optional[str], position: PositionDTO) -> None:
+        self.id: int = id
+        self.name: str = name
+        self.image_filename: Optional[str] = image_filename
+        self.id_number: Optional[str] = id_number
+        self.position: PositionDTO = position
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'image_filename': self.image_filename,
+            'id_number': self.id_number,
+            'position_id': self.position.id
+        }
+
+class ElectionDTO:
+    """
+    Read-only view of an Election with its candidates and their positions.
+
+    Templates, JSON responses and socket payloads all read elections through
+    this class, it can be used in place of an Election in templates.
+
+    Attributes:
+        candidates: The candidates, newest first like Election.candidates.
+        positions: The positions that have candidates, in id order.
+    """
+    __slots__ = ('id', 'title', 'start_date_and_time', 'end_date_and_time', 'created_at', 'candidates', 'positions', '_dict')
+
+    datetime_readable = staticmethod(BaseModel.datetime_readable)
+
+    def __init__(
+        self,
+        id: int,
+        title: str,
+        start_date_and_time: datetime,
+        end_date_and_time: datetime,
+        created_at: Optional[datetime],
+        candidates: Tuple[CandidateDTO, ...]
+    ) -> None:
+        self.id: int = id
+        self.title: str = title
+        self.start_date_and_time: datetime = start_date_and_time
+        self.end_date_and_time: datetime = end_date_and_time
+        self.created_at: Optional[datetime] = created_at
+        self.candidates: Tuple[CandidateDTO, ...] = candidates
+        self.positions: Tuple[PositionDTO, ...] = tuple(sorted(
+            {candidate.position.id: candidate.position for candidate in candidates}.values(),
+            key=lambda position: position.id
+        ))
+        self._dict: Optional[Dict[str, Any]] = None
+
+    def candidates_for(self, position_id: int) -> List[CandidateDTO]:
+        """
+        Returns the candidates running for a position.
+        """
+        return [candidate for candidate in self.candidates if candidate.position.id == position_id]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the JSON-ready form of the election, built once per DTO.
+        """
+        if self._dict is None:
+            self._dict = {
+                'id': self.id,
+                'title': self.title,
+                'start_date_and_time': self.start_date_and_time.isoformat(),
+                'end_date_and_time': self.end_date_and_time.isoformat(),
+                'positions': [position.to_dict() for position in self.positions],
+                'candidates': [candidate.to_dict() for candidate in self.candidates]
+            }
+
+        return self._dict
+
+def _to_dto(election: Election, positions: Dict[int, PositionDTO]) -> ElectionDTO:
+    """
+    Converts a loaded Election graph, sharing one PositionDTO per position.
+    """
+    candidates: List[CandidateDTO] = []
+
+    for candidate in election.candidates:
+        position: Optional[PositionDTO] = positions.get(candidate.position_id)
+
+        if position is None:
+            position = positions[candidate.position_id] = PositionDTO(candidate.position.id, candidate.position.name)
+
+        candidates.append(CandidateDTO(candidate.id, candidate.name, candidate.image_filename, candidate.id_number, position))
+
+    return ElectionDTO(
+        int(election.id),
+        str(election.title),
+        cast(datetime, election.start_date_and_time),
+        cast(datetime, election.end_date_and_time),
+        cast(Optional[datetime], election.created_at),
+        tuple(candidates)
+    )
+
+class ElectionReadModel:
+    """
+    Loads election graphs in a fixed number of queries and caches them as DTOs.
+
+    Each election has a version that `invalidate` bumps when it, its candidates or
+    their positions change. A cached DTO is served until its version moves on.
+    Changes committed by other workers are picked up through `data_version`,
+    which invalidates the elections they belong to, or every election when a
+    position changed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an ElectionReadModel instance.
+        """
+        self._lock: threading.Lock = threading.Lock()
+        self._versions: Dict[int, int] = {}
+        self._generation: int = 0
+        self._cache: Dict[int, Tuple[Tuple[int, int], ElectionDTO]] = {}
+        self._changes: int = 0
+        self._newest: Optional[Tuple[Optional[int]]] = None
+
+    def _version(self, election_id: int) -> Tuple[int, int]:
+        return self._generation, self._versions.get(election_id, 0)
+
+    def _cached(self, election_id: int) -> Optional[ElectionDTO]:
+        entry: Optional[Tuple[Tuple[int, int], ElectionDTO]] = self._cache.get(election_id)
+
+        if entry is not None and entry[0] == self._version(election_id):
+            return entry[1]
+
+        return None
+
+    def _load(self, election_ids: Iterable[int]) -> Dict[int, ElectionDTO]:
+        """
+        Loads elections with their candidates and positions in two queries.
+        """
+        with self._lock:
+            versions: Dict[int, Tuple[int, int]] = {election_id: self._version(election_id) for election_id in election_ids}
+
+        elections: List[Election] = Election.query.options(
+            selectinload(Election.candidates).joinedload(Candidate.position)
+        ).filter(Election.id.in_(list(versions))).all()
+
+        positions: Dict[int, PositionDTO] = {}
+        loaded: Dict[int, ElectionDTO] = {dto.id: dto for dto in (_to_dto(election, positions) for election in elections)}
+
+        with self._lock:
+            for election_id, election in loaded.items():
+                # Only cache if nothing changed the election while it was loading
+                if self._version(election_id) == versions[election_id]:
+                    self._cache[election_id] = (versions[election_id], election)
+
+        return loaded
+
+    def get(self, election_id: int) -> Optional[ElectionDTO]:
+        """
+        Returns an election graph.
+
+        Args:
+            election_id (int): The election to read.
+
+        Returns:
+            Optional[ElectionDTO]: The election, or None if it does not exist.
+        """
+        cached: Optional[ElectionDTO] = self._cached(election_id)
+
+        if cached is not None:
+            return cached
+
+        return self._load([election_id]).get(election_id)
+
+    def all(self) -> List[ElectionDTO]:
+        """
+        Returns every election graph, newest first.
+
+        One query lists the election ids, the elections that are not cached
+        are then loaded together.
+
+        Returns:
+            List[ElectionDTO]: The elections.
+        """
+        election_ids: List[int] = [
+            election_id for (election_id,) in db.session.query(Election.id).order_by(Election.created_at.desc())
+        ]
+
+        elections: Dict[int, ElectionDTO] = {}
+        missing: List[int] = []
+
+        for election_id in election_ids:
+            cached: Optional[ElectionDTO] = self._cached(election_id)
+
+            if cached is None:
+                missing.append(election_id)
+            else:
+                elections[election_id] = cached
+
+        if missing:
+            elections.update(self._load(missing))
+
+        return [elections[election_id] for election_id in election_ids if election_id in elections]
+
+    def newest_id(self) -> Optional[int]:
+        """
+        Returns the id of the most recently created election, read once until an election changes.
+
+        Returns:
+            Optional[int]: The election id, or None if there are no elections.
+        """
+        with self._lock:
+            newest: Optional[Tuple[Optional[int]]] = self._newest
+            changes: int = self._changes
+
+        if newest is not None:
+            return newest[0]
+
+        election_id: Optional[int] = db.session.scalar(
+            select(Election.id).order_by(Election.created_at.desc()).limit(1)
+        )
+
+        with self._lock:
+            # Only cache if no election was created or deleted while reading
+            if self._changes == changes:
+                self._newest = (election_id,)
+
+        return election_id
+
+    def invalidate(self, election_id: Optional[int] = None) -> None:
+        """
+        Moves an election, or every election, to a new version.
+
+        Args:
+            election_id (Optional[int]): The changed election, all of them when omitted.
+        """
+        with self._lock:
+            self._changes += 1
+            self._newest = None
+
+            if election_id is None:
+                self._generation += 1
+                self._cache.clear()
+            else:
+                self._versions[election_id] = self._versions.get(election_id, 0) + 1
+                self._cache.pop(election_id, None)
+
+election_read_model: ElectionReadModel = ElectionReadModel()
@@ -0,0 +1,227 @@
+from socketio import KafkaManager, KombuManager, Manager, PubSubManager, RedisManager, ZmqManager # type: ignore
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type
+import sqlite3
+import pickle
+import time
+
+# Emits on this namespace are handed to the worker handlers of every process, never to clients
+WORKER_NAMESPACE: str = '/workers'
+
+_worker_handlers: Dict[str, Callable[[Any], None]] = {}
+
+def on_worker_message(event: str) -> Callable[[Callable[[Any], None]], Callable[[Any], None]]:
+    """
+    Registers the function every worker runs when `event` is emitted on WORKER_NAMESPACE.
+
+    Handlers run in the process that emitted and in every process reached by the
+    message queue, on the queue's listener thread and without an app context.
+
+    >>> @on_worker_message('votes')
+    >>> def count_votes(votes):
+    >>>     ...
+    >>> socketio.emit('votes', votes, namespace=WORKER_NAMESPACE)
+    """
+    def register(handler: Callable[[Any], None]) -> Callable[[Any], None]:
+        _worker_handlers[event] = handler
+        return handler
+
+    return register
+
+class BoundedManager(Manager):
+    """
+    In-process client manager that stops queueing packets for slow clients.
+
+    Engine.IO gives every client an unbounded send queue. A phone on a bad
+    connection that drains it slower than results are broadcast would make it
+    grow for as long as it stays connected, so clients that already have
+    `max_pending` packets waiting are skipped. Broadcasts carry full snapshots,
+    so a skipped client catches up with the next one it can take.
+    """
+
+    def __init__(self, max_pending: int = 64) -> None:
+        """
+        Initialize a BoundedManager instance.
+
+        Args:
+            max_pending (int): Packets a client may have queued before it is skipped.
+        """
+        super().__init__()
+        self.max_pending: int = max_pending
+
+    def _saturated(self, namespace: str, room: Any) -> List[str]:
+        """
+        Returns the sids in a room whose Engine.IO send queue is full.
+        """
+        sockets: Dict[str, Any] = self.server.eio.sockets
+        saturated: List[str] = []
+
+        for sid, eio_sid in self.get_participants(namespace, room):
+            socket: Any = sockets.get(eio_sid)
+
+            if socket is not None and socket.queue.qsize() >= self.max_pending:
+                saturated.append(sid)
+
+        if saturated:
+            self._get_logger().warning('Skipping %d clients with full send queues', len(saturated))
+
+        return saturated
+
+    def emit(self, event, data, namespace, room=None, skip_sid=None, callback=None, **kwargs):
+        """
+        Emits like Manager.emit, skipping clients whose send queue is full.
+        Worker messages are handed to their handler instead.
+        """
+        if namespace == WORKER_NAMESPACE:
+            handler: Optional[Callable[[Any], None]] = _worker_handlers.get(event)
+
+            if handler is not None:
+                handler(data)
+
+            return None
+
+        if namespace in self.rooms and self.max_pending:
+            skip: List[Optional[str]] = skip_sid if isinstance(skip_sid, list) else [skip_sid]
+            skip_sid = skip + self._saturated(namespace, room)
+
+        return super().emit(event, data, namespace, room=room, skip_sid=skip_sid, callback=callback, **kwargs)
+
+class SQLiteManager(PubSubManager, BoundedManager):
+    """
+    Client manager that shares emits between worker processes through a SQLite file.
+
+    Every worker appends the messages it publishes to a table and polls it for
+    messages published by the others. No external service is needed, only a
+    file every worker on the host can reach.
+
+    >>> SQLiteManager('/var/run/marv/socketio.db')
+    """
+    name = 'sqlite'
+
+    def __init__(
+        self,
+        path: str,
+        channel: str = 'socketio',
+        write_only: bool = False,
+        logger: Any = None,
+        poll_interval: float = 0.05,
+        retention: float = 60,
+        max_pending: int = 64
+    ) -> None:
+        """
+        Initialize a SQLiteManager instance.
+
+        Args:
+            path (str): The SQLite database file used as the queue.
+            channel (str): Messages are only exchanged between managers on the same channel.
+            write_only (bool): Only publish, used by processes that never hold clients.
+            logger: The logger used by the manager.
+            poll_interval (float): Seconds between polls for new messages.
+            retention (float): Seconds published messages are kept before being pruned.
+            max_pending (int): Packets a client may have queued before it is skipped.
+        """
+        # PubSubManager passes no arguments on to BoundedManager
+        PubSubManager.__init__(self, channel=channel, write_only=write_only, logger=logger)
+        self.max_pending = max_pending
+        self.path: str = path
+        self.poll_interval: float = poll_interval
+        self.retention: float = retention
+        self._published: int = 0
+
+        with self._connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS socketio_messages ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'channel TEXT NOT NULL, '
+                'payload BLOB NOT NULL, '
+                'created_at REAL NOT NULL)'
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens a connection, one per call since connections cannot cross threads.
+        """
+        connection: sqlite3.Connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute('PRAGMA journal_mode=WAL')
+        return connection
+
+    def _publish(self, data: Dict[str, Any]) -> None:
+        """
+        Appends a message for the other workers and prunes expired ones now and then.
+        """
+        now: float = time.time()
+
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT INTO socketio_messages (channel, payload, created_at) VALUES (?, ?, ?)',
+                (self.channel, pickle.dumps(data), now)
+            )
+
+            self._published += 1
+
+            if self._published % 500 == 0:
+                connection.execute('DELETE FROM socketio_messages WHERE created_at < ?', (now - self.retention,))
+
+    def _listen(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields every message published after the listener started.
+        """
+        connection: sqlite3.Connection = self._connect()
+        last_id: int = connection.execute('SELECT COALESCE(MAX(id), 0) FROM socketio_messages').fetchone()[0]
+
+        while True:
+            rows: List[Any] = connection.execute(
+                'SELECT id, payload FROM socketio_messages WHERE id > ? AND channel = ? ORDER BY id',
+                (last_id, self.channel)
+            ).fetchall()
+
+            # Ending the read transaction lets the next poll see new writes
+            connection.commit()
+
+            for message_id, payload in rows:
+                last_id = message_id
+                yield pickle.loads(payload)
+
+            if not rows:
+                self.server.sleep(self.poll_interval)
+
+def _bounded(queue_class: Type[PubSubManager]) -> Type[PubSubManager]:
+    """
+    Combines a python-socketio pub/sub manager with BoundedManager, so it skips
+    saturated clients and hands worker messages to their handlers.
+    """
+    return type(f'Bounded{queue_class.__name__}', (queue_class, BoundedManager), {})
+
+def create_client_manager(url: Optional[str], channel: str = 'socketio', max_pending: int = 64) -> Manager:
+    """
+    Builds the Socket.IO client manager for a message queue url.
+
+    Args:
+        url (Optional[str]): None or 'memory://' for a single process, 'sqlite:///<path>'
+                             to share emits between processes through a file, or a
+                             redis://, kafka://, zmq+tcp:// or amqp:// broker url.
+        channel (str): The channel shared by the workers of one deployment.
+        max_pending (int): Packets a client may have queued before it is skipped.
+
+    Returns:
+        Manager: The manager.
+    """
+    if not url or url == 'memory://':
+        return BoundedManager(max_pending=max_pending)
+
+    if url.startswith('sqlite:///'):
+        return SQLiteManager(url[len('sqlite:///'):], channel=channel, max_pending=max_pending)
+
+    # The same url schemes Flask-SocketIO accepts for its message_queue option
+    if url.startswith(('redis://', 'rediss://')):
+        queue_class: Type[PubSubManager] = RedisManager
+    elif url.startswith('kafka://'):
+        queue_class = KafkaManager
+    elif url.startswith('zmq'):
+        queue_class = ZmqManager
+    else:
+        queue_class = KombuManager
+
+    manager: BoundedManager = _bounded(queue_class)(url, channel=channel)
+    manager.max_pending = max_pending
+
+    return manager
@@ -0,0 +1,167 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import Row
+import numpy as np
+
+NO_CHOICE: int = -1
+
+class Round(NamedTuple):
+    """
+    The outcome of one instant-runoff round.
+
+    Attributes:
+        number: The round number, starting at 1.
+        tallies: Votes per candidate id still in the race.
+        exhausted: Ballots with no continuing candidate left.
+        eliminated: The candidate id eliminated after this round, if any.
+        winner: The candidate id that won in this round, if any.
+    """
+    number: int
+    tallies: Dict[int, int]
+    exhausted: int
+    eliminated: Optional[int]
+    winner: Optional[int]
+
+def build_ballots(voter_ids: np.ndarray, candidate_ids: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """
+    Packs ranked preferences into a ballot matrix.
+
+    The preferences must be sorted by voter and then by rank. Each row of the
+    result is one ballot and holds candidate indices into `candidates` in order
+    of preference, padded with NO_CHOICE.
+
+    Args:
+        voter_ids (np.ndarray): The voter of each preference.
+        candidate_ids (np.ndarray): The ranked candidate of each preference.
+        candidates (np.ndarray): The sorted ids of every candidate in the race.
+
+    Returns:
+        np.ndarray: An (ballots, max ranks) int32 matrix.
+    """
+    if voter_ids.size == 0:
+        return np.empty((0, 0), dtype=np.int32)
+
+    # A new ballot starts wherever the voter id changes
+    new_ballot: np.ndarray = np.r_[True, voter_ids[1:] != voter_ids[:-1]]
+    starts: np.ndarray = np.flatnonzero(new_ballot)
+    ballot_of: np.ndarray = np.cumsum(new_ballot) - 1
+    column_of: np.ndarray = np.arange(voter_ids.size) - starts[ballot_of]
+
+    ballots: np.ndarray = np.full((starts.size, int(column_of.max()) + 1), NO_CHOICE, dtype=np.int32)
+    ballots[ballot_of, column_of] = np.searchsorted(candidates, candidate_ids)
+
+    return ballots
+
+def instant_runoff(ballots: np.ndarray, candidates: np.ndarray) -> List[Round]:
+    """
+    Runs instant-runoff elimination rounds over a ballot matrix.
+
+    Every round finds the highest ranked continuing candidate of all ballots at
+    once and counts them with a single bincount. The candidate with the fewest
+    votes is eliminated until one holds a majority of the continuing ballots.
+    Ties for last place are broken by the earlier rounds, then by the higher id.
+
+    Args:
+        ballots (np.ndarray): A matrix built by build_ballots.
+        candidates (np.ndarray): The sorted ids of every candidate in the race.
+
+    Returns:
+        List[Round]: Every round up to and including the one with a winner.
+    """
+    candidate_count: int = candidates.size
+
+    if candidate_count == 0:
+        return []
+
+    # The extra trailing slot is what NO_CHOICE (-1) indexes and is never active
+    active: np.ndarray = np.ones(candidate_count + 1, dtype=bool)
+    active[-1] = False
+
+    rows: np.ndarray = np.arange(ballots.shape[0])
+    history: List[np.ndarray] = []
+    rounds: List[Round] = []
+
+    while True:
+        if ballots.size:
+            continuing: np.ndarray = active[ballots]
+            first: np.ndarray = continuing.argmax(axis=1)
+            live: np.ndarray = continuing[rows, first]
+            counts: np.ndarray = np.bincount(ballots[rows, first][live], minlength=candidate_count)
+            live_total: int = int(live.sum())
+        else:
+            counts = np.zeros(candidate_count, dtype=np.int64)
+            live_total = 0
+
+        history.append(counts)
+        standing: np.ndarray = np.flatnonzero(active[:-1])
+        tallies: Dict[int, int] = {int(candidates[index]): int(counts[index]) for index in standing}
+        exhausted: int = ballots.shape[0] - live_total
+
+        leader: int = int(standing[np.argmax(counts[standing])])
+
+        if counts[leader] * 2 > live_total or standing.size == 1:
+            rounds.append(Round(len(rounds) + 1, tallies, exhausted, None, int(candidates[leader])))
+            return rounds
+
+        loser: int = _lowest(standing, history)
+        active[loser] = False
+        rounds.append(Round(len(rounds) + 1, tallies, exhausted, int(candidates[loser]), None))
+
+def _lowest(standing: np.ndarray, history: List[np.ndarray]) -> int:
+    """
+    Picks the candidate index to eliminate, breaking ties with earlier rounds.
+    """
+    tied: np.ndarray = standing
+
+    for counts in reversed(history):
+        tied = tied[counts[tied] == counts[tied].min()]
+
+        if tied.size == 1:
+            break
+
+    return int(tied[-1])
+
+def load_ballots(election_id: int, position_id: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Loads the ranked ballots of a position into arrays.
+
+    Args:
+        election_id (int): The election the ballots were cast in.
+        position_id (int): The position being tabulated.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The ballot matrix and the sorted candidate ids.
+    """
+    from Engine.models import Candidate, RankedVote
+    from Engine import db
+
+    candidates: np.ndarray = np.fromiter(
+        (row[0] for row in db.session.query(Candidate.id).filter_by(
+            election_id=election_id,
+            position_id=position_id
+        ).order_by(Candidate.id)),
+        dtype=np.int64
+    )
+
+    preferences: List[Row[Tuple[int, int]]] = db.session.query(
+        RankedVote.voter_id,
+        RankedVote.candidate_id
+    ).filter_by(
+        election_id=election_id,
+        position_id=position_id
+    ).filter(
+        RankedVote.candidate_id.in_(candidates.tolist())
+    ).order_by(RankedVote.voter_id, RankedVote.rank).all()
+
+    columns: np.ndarray = np.array(preferences, dtype=np.int64).reshape(-1, 2)
+
+    return build_ballots(columns[:, 0], columns[:, 1], candidates), candidates
+
+def tabulate(election_id: int, position_id: int) -> List[Round]:
+    """
+    Returns the instant-runoff rounds of a ranked-choice position.
+
+    >>> for result in tabulate(election.id, position.id):
+    >>>     print(result.number, result.tallies, result.eliminated, result.winner)
+    """
+    ballots, candidates = load_ballots(election_id, position_id)
+    return instant_runoff(ballots, candidates)
@@ -0,0 +1,151 @@
+from flask import Flask, current_app, render_template
+from jinja2 import FileSystemBytecodeCache
+from typing import Dict, List, Optional, Tuple
+import stat
+import os
+
+PRODUCTION_MODE: str = 'production'
+SHELL_MARKER: str = '<!--prerendered-fragment-->'
+
+def configure_templates(app: Flask) -> None:
+    """
+    Switches Jinja to the production template mode when TEMPLATE_MODE is 'production'.
+
+    Compiled templates are stored in a bytecode cache directory shared by every
+    worker on the host and templates are never checked for changes. Must run
+    before anything touches `app.jinja_env`.
+
+    The cache directory is TEMPLATE_BYTECODE_CACHE_DIR, or else Jinja's own
+    per-user directory in the temp directory.
+
+    Args:
+        app (Flask): The application being configured.
+    """
+    if app.config.get('TEMPLATE_MODE') != PRODUCTION_MODE:
+        return
+
+    cache_directory: Optional[str] = app.config.get('TEMPLATE_BYTECODE_CACHE_DIR')
+
+    if cache_directory:
+        check_cache_directory(cache_directory)
+
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
+    app.jinja_options = {
+        **app.jinja_options,
+        'auto_reload': False,
+        'bytecode_cache': FileSystemBytecodeCache(cache_directory or None)
+    }
+
+def check_cache_directory(path: str) -> None:
+    """
+    Creates the bytecode cache directory if needed and makes sure no other user can write to it.
+
+    Cached bytecode is loaded with marshal, so a directory another user can
+    write to lets them run code in the workers.
+
+    Args:
+        path (str): The cache directory.
+
+    Raises:
+        RuntimeError: If the directory is a symlink or not a directory, is owned by
+                      another user, or is writable by its group or others.
+    """
+    os.makedirs(path, mode=stat.S_IRWXU, exist_ok=True)
+    status: os.stat_result = os.lstat(path)
+
+    if not stat.S_ISDIR(status.st_mode) or status.st_uid != os.getuid() or status.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise RuntimeError(
+            f"TEMPLATE_BYTECODE_CACHE_DIR {path!r} must be a directory owned by this user "
+            "that its group and others cannot write to"
+        )
+
+def project_templates(app: Flask) -> List[str]:
+    """
+    Returns the names of the templates shipped with this project, leaving out
+    the ones of installed packages such as Flask-Admin.
+
+    Args:
+        app (Flask): The application with every blueprint registered.
+
+    Returns:
+        List[str]: Template names as passed to render_template.
+    """
+    loaders: List = [app.jinja_loader] + [
+        blueprint.jinja_loader
+        for blueprint in app.iter_blueprints()
+        if blueprint.root_path.startswith(app.root_path)
+    ]
+
+    names: List[str] = []
+
+    for loader in loaders:
+        if loader is not None:
+            names.extend(name for name in loader.list_templates() if name.endswith('.html'))
+
+    return sorted(set(names))
+
+def precompile_templates(app: Flask) -> None:
+    """
+    Compiles every project template into the bytecode cache and the
+    environment's in-memory cache, and prerenders the page shells.
+
+    Args:
+        app (Flask): The application with every blueprint registered.
+    """
+    if app.config.get('TEMPLATE_MODE') != PRODUCTION_MODE:
+        return
+
+    for name in project_templates(app):
+        app.jinja_env.get_template(name)
+
+    prerender_shell(app, 'index.html', 'elections')
+
+def prerender_shell(app: Flask, template_name: str, block_name: str) -> None:
+    """
+    Renders everything of a page except one block and keeps the html on both sides of it.
+
+    The block must only depend on its own context, everything else in the page
+    must be the same for every request.
+
+    Args:
+        app (Flask): The application being configured.
+        template_name (str): The page template.
+        block_name (str): The block filled in per request.
+    """
+    child: str = f"{{% extends '{template_name}' %}}{{% block {block_name} %}}{SHELL_MARKER}{{% endblock %}}"
+
+    with app.test_request_context('/'):
+        html: str = app.jinja_env.from_string(child).render(**_default_context(app))
+
+    prefix, suffix = html.split(SHELL_MARKER, 1)
+    app.extensions.setdefault('prerendered_shells', {})[template_name] = (prefix, suffix)
+
+def _default_context(app: Flask) -> Dict:
+    """
+    Returns the context render_template would add, such as url_for and config.
+    """
+    context: Dict = {}
+    app.update_template_context(context)
+    return context
+
+def render_page(template_name: str, fragment_name: str, **context) -> str:
+    """
+    Renders a page, only rendering its dynamic fragment when the shell was prerendered.
+
+    >>> render_page("index.html", "elections.html", elections=elections)
+
+    Args:
+        template_name (str): The page template.
+        fragment_name (str): The template of the block filled in per request.
+        **context: The variables of the fragment.
+
+    Returns:
+        str: The rendered page.
+    """
+    shells: Dict[str, Tuple[str, str]] = current_app.extensions.get('prerendered_shells', {})
+
+    if template_name not in shells:
+        return render_template(template_name, **context)
+
+    prefix, suffix = shells[template_name]
+    return prefix + render_template(fragment_name, **context) + suffix
@@ -1,47 +1,45 @@
 from wtforms.validators import DataRequired, Length, ValidationError, Email # type: ignore
 from wtforms import StringField, PasswordField, EmailField # type: ignore
+from typing import List, Optional, Tuple
 from flask_wtf import FlaskForm # type: ignore
 from Engine.models import User
+from sqlalchemy import or_
 import re
 
 def validate_username(form: FlaskForm, field: StringField) -> None:
     """
     Validate the username field.
 
+    Whether the username is taken is checked by RegisterForm.validate together
+    with the email, in a single query.
+
     Args:
         form (FlaskForm): The form that contains the field.
         field (StringField): The field to be validated.
 
     Raises:
-        ValidationError: If the username is empty or already taken.
+        ValidationError: If the username is empty.
     """
     if not field.data:
         raise ValidationError("Username cannot be empty")
 
-    user: User = User.query.filter_by(username=field.data).first()
-
-    if user:
-        raise ValidationError("Username already taken")
-
 def validate_email(form: FlaskForm, field: StringField) -> None:
     """
     Validate the email field.
 
+    Whether the email is taken is checked by RegisterForm.validate together
+    with the username, in a single query.
+
     Args:
         form (FlaskForm): The form that contains the field.
         field (StringField): The field to be validated.
 
     Raises:
-        ValidationError: If the email is empty or already taken.
+        ValidationError: If the email is empty.
     """
     if not field.data:
         raise ValidationError("Email cannot be empty")
 
-    user: User = User.query.filter_by(email=field.data).first()
-
-    if user:
-        raise ValidationError("Email already taken")
-
 def validate_password(form: FlaskForm, field: PasswordField) -> None:
     """
     Validate the password field.
@@ -128,6 +126,39 @@ class RegisterForm(FlaskForm):
         ]
     )
 
+    def validate(self, extra_validators=None) -> bool:
+        """
+        Validates the fields, then looks up a taken username or email with one query.
+
+        Returns:
+            bool: True if the form is valid and neither the username nor the email is taken.
+        """
+        if not super().validate(extra_validators):
+            return False
+
+        taken: List[Tuple[str, str]] = User.query.with_entities(User.username, User.email).filter(or_(
+            User.username == self.register_username.data,
+            User.email == self.register_email.data
+        )).all()
+
+        self.add_taken_errors(taken)
+
+        return not (self.register_username.errors or self.register_email.errors)
+
+    def add_taken_errors(self, taken: List[Tuple[str, str]]) -> None:
+        """
+        Adds "already taken" errors for existing (username, email) rows that clash with the form.
+
+        Args:
+            taken (List[Tuple[str, str]]): The usernames and emails of the clashing users.
+        """
+        for username, email in taken:
+            if username == self.register_username.data:
+                self.register_username.errors.append("Username already taken")
+
+            if email == self.register_email.data:
+                self.register_email.errors.append("Email already taken")
+
 class LoginForm(FlaskForm):
     """
     Form for user login.
@@ -135,7 +166,9 @@ class LoginForm(FlaskForm):
     Attributes:
         login_email (EmailField): Field for the email input.
         login_password (PasswordField): Field for the password input.
+        user (Optional[User]): The user found while validating the email.
     """
+    user: Optional[User] = None
 
     login_email: EmailField = EmailField(
         u'Email',
@@ -160,9 +193,9 @@ class LoginForm(FlaskForm):
         if not login_email.data:
             raise ValidationError("Email cannot be empty")
 
-        user = User.query.filter_by(email=login_email.data).first()
+        self.user = User.query.filter_by(email=login_email.data.strip()).first()
 
-        if not user:
+        if not self.user:
             raise ValidationError("\nEmail not found or User not yet registered")
 
     login_password: PasswordField = PasswordField(
@@ -0,0 +1,180 @@
+from werkzeug.security import check_password_hash, generate_password_hash
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+from flask import Flask
+import threading
+import time
+
+T = TypeVar('T')
+
+class HashingBusy(Exception):
+    """
+    Raised when every password hashing slot is taken, or a hash does not finish, within the wait timeout.
+    """
+
+class HashingPool:
+    """
+    Runs password hashing on a small, bounded pool of threads.
+
+    Werkzeug's scrypt and pbkdf2 hashes are deliberately slow. hashlib releases
+    the GIL while computing them, so running them here keeps the Socket.IO worker
+    free for other clients while a login or registration waits on its result.
+    At most `max_workers + max_pending` hashes are accepted at a time.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16, timeout: float = 10) -> None:
+        """
+        Initialize a HashingPool instance.
+
+        Args:
+            max_workers (int): Threads computing hashes.
+            max_pending (int): Hashes allowed to wait for a free thread.
+            timeout (float): Seconds a request waits for a slot and then for its result.
+        """
+        self.configure(max_workers, max_pending, timeout)
+
+    def configure(self, max_workers: int, max_pending: int, timeout: float) -> None:
+        """
+        Sets the pool limits, replacing the threads.
+        """
+        if getattr(self, '_executor', None) is not None:
+            self._executor.shutdown(wait=False)
+
+        self.timeout: float = timeout
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(max_workers + max_pending)
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hash')
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Reads the pool limits from the application config.
+
+        Args:
+            app (Flask): The application being configured.
+        """
+        self.configure(
+            app.config.get('PASSWORD_HASH_WORKERS', 2),
+            app.config.get('PASSWORD_HASH_MAX_PENDING', 16),
+            app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        )
+
+    def _run(self, function: Callable[..., T], *args) -> T:
+        """
+        Runs a function on the pool and waits for its result.
+
+        A slot is held until the function finishes, even when the caller stopped
+        waiting for it, so abandoned hashes still count towards the limit.
+
+        Raises:
+            HashingBusy: If no slot frees up, or the result is not ready, within the timeout.
+        """
+        slots: threading.BoundedSemaphore = self._slots
+
+        if not slots.acquire(timeout=self.timeout):
+            raise HashingBusy()
+
+        try:
+            future: Future = self._executor.submit(function, *args)
+        except BaseException:
+            slots.release()
+            raise
+
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HashingBusy()
+
+    def check(self, password_hash: str, password: str) -> bool:
+        """
+        Checks a password against its hash on the pool.
+        """
+        return self._run(check_password_hash, password_hash, password)
+
+    def generate(self, password: str) -> str:
+        """
+        Hashes a password on the pool.
+        """
+        return self._run(generate_password_hash, password)
+
+class TokenBucketLimiter:
+    """
+    In-memory token bucket per client key, used to limit login attempts per IP.
+
+    Every key may burst `capacity` attempts and then earns one more every
+    `1 / refill_rate` seconds. Buckets that have refilled completely are
+    forgotten once more than `max_keys` are tracked.
+    """
+
+    def __init__(self, capacity: float = 5, refill_rate: float = 1 / 12, max_keys: int = 10000) -> None:
+        """
+        Initialize a TokenBucketLimiter instance.
+
+        Args:
+            capacity (float): The largest burst allowed.
+            refill_rate (float): Tokens earned per second.
+            max_keys (int): Buckets tracked before full ones are dropped.
+        """
+        self.capacity: float = capacity
+        self.refill_rate: float = refill_rate
+        self.max_keys: int = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Reads the bucket size and refill rate from the application config.
+
+        Args:
+            app (Flask): The application being configured.
+        """
+        self.capacity = app.config.get('LOGIN_RATE_LIMIT_CAPACITY', self.capacity)
+        self.refill_rate = app.config.get('LOGIN_RATE_LIMIT_REFILL_PER_SECOND', self.refill_rate)
+        self._buckets.clear()
+
+    def _tokens(self, bucket: Optional[Tuple[float, float]], now: float) -> float:
+        """
+        Returns the tokens a bucket holds at `now`.
+        """
+        if bucket is None:
+            return self.capacity
+
+        tokens, updated_at = bucket
+        return min(self.capacity, tokens + (now - updated_at) * self.refill_rate)
+
+    def _prune(self, now: float) -> None:
+        """
+        Drops full buckets, must be called with the lock held.
+        """
+        full: List[str] = [key for key, bucket in self._buckets.items() if self._tokens(bucket, now) >= self.capacity]
+
+        for key in full:
+            del self._buckets[key]
+
+    def consume(self, key: str) -> float:
+        """
+        Takes one token from the bucket of a key.
+
+        Args:
+            key (str): The client the attempt is made by.
+
+        Returns:
+            float: 0 if the attempt is allowed, otherwise the seconds until it would be.
+        """
+        now: float = time.monotonic()
+
+        with self._lock:
+            tokens: float = self._tokens(self._buckets.get(key), now)
+
+            if tokens < 1:
+                return (1 - tokens) / self.refill_rate
+
+            self._buckets[key] = (tokens - 1, now)
+
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+
+            return 0
+
+hashing_pool: HashingPool = HashingPool()
+login_limiter: TokenBucketLimiter = TokenBucketLimiter()
@@ -1,12 +1,14 @@
 from flask import Blueprint, Response, jsonify, redirect, render_template, request, url_for
-from werkzeug.security import check_password_hash, generate_password_hash
+from Engine.user.security import HashingBusy, hashing_pool, login_limiter
 from werkzeug.wrappers.response import Response as RedirectResponse
 from Engine.user.forms import RegisterForm, LoginForm
 from flask_login import login_user, logout_user
+from sqlalchemy.exc import IntegrityError
 from Engine.models import User
 from typing import Optional
 from Engine import db
 import traceback
+import math
 
 app_admin: Blueprint = Blueprint('app_admin', __name__, template_folder='templates/user', static_folder='static/user')
 
@@ -27,12 +29,25 @@ def login() -> Response:
     """
     Logs user in.
 
+    Attempts are limited per IP address and the password is checked on the
+    hashing pool so a burst of logins does not stall the socket worker.
+
     Returns:
         - JSON response with status=success if login is successful
         - JSON response with status=error, error message, and form errors if login is unsuccessful
     """
+    retry_after: float = login_limiter.consume(request.remote_addr or '')
+
+    if retry_after:
+        response: Response = jsonify({
+            'status': 'error',
+            'message': [f"Too many login attempts, try again in {math.ceil(retry_after)} seconds"]
+        })
+        response.status_code = 429
+        response.headers['Retry-After'] = str(math.ceil(retry_after))
+        return response
+
     form: LoginForm = LoginForm(request.form)
-    email_input: str = form.login_email.data.strip()
 
     if not form.validate():
         return jsonify({
@@ -40,9 +55,17 @@ def login() -> Response:
             'message': [field.errors for field in form if field.errors]
         })
 
-    user: Optional[User] = User.query.filter_by(email=email_input).first()
+    user: Optional[User] = form.user
 
-    if user and check_password_hash(str(user.password_hash), form.login_password.data):
+    try:
+        password_matches: bool = user is not None and hashing_pool.check(str(user.password_hash), form.login_password.data)
+    except HashingBusy:
+        return jsonify({
+            'status': 'error',
+            'message': ["The server is busy, please try again"]
+        })
+
+    if user and password_matches:
         login_user(user)
         return jsonify({
             'status': 'success',
@@ -80,6 +103,10 @@ def register() -> RedirectResponse:
     """
     Registers user.
 
+    Taken usernames and emails are found with one query while validating, and a
+    registration racing another for the same username or email is caught by the
+    unique constraints on commit.
+
     Returns:
         - Redirects to the login_form route if registration is successful
         - Renders the register.html template with form errors if registration is unsuccessful
@@ -102,17 +129,36 @@ def register() -> RedirectResponse:
         user: User = User(
             username=form.register_username.data,
             email=form.register_email.data,
-            password_hash=generate_password_hash(form.register_password.data)
+            password_hash=hashing_pool.generate(form.register_password.data)
         )
 
         db.session.add(user)
-        db.session.commit()
+
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+
+            form.add_taken_errors(User.query.with_entities(User.username, User.email).filter(
+                (User.username == user.username) | (User.email == user.email)
+            ).all())
+
+            return jsonify({
+                'status': 'error',
+                'message': [field.errors for field in form if field.errors] or ["Error in registering user"]
+            })
 
         return jsonify({
             'status': 'success',
             'url': url_for('app_admin.login_form')
         })
 
+    except HashingBusy:
+        return jsonify({
+            'status': 'error',
+            'message': ["The server is busy, please try again"]
+        })
+
     except Exception as error:
         print(f"{error}")
         traceback.print_exc()
@@ -0,0 +1,84 @@
+from typing import Dict, List
+import statistics
+import subprocess
+import argparse
+import json
+import sys
+
+# Runs inside a fresh interpreter so every measurement is a real cold start
+PROBE: str = """
+import json, resource, sys, time
+started = time.perf_counter()
+from Engine import create_app
+create_app(profile=sys.argv[1])
+print(json.dumps({
+    'milliseconds': (time.perf_counter() - started) * 1000,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'admin_loaded': [name for name in ('flask_admin', 'wtforms', 'flask_wtf') if name in sys.modules]
+}))
+"""
+
+def measure(profile: str, runs: int) -> List[Dict]:
+    """
+    Starts the application `runs` times in new processes.
+
+    Args:
+        profile (str): The create_app profile to start.
+        runs (int): The number of cold starts.
+
+    Returns:
+        List[Dict]: The startup time, peak memory and admin modules of every run.
+    """
+    samples: List[Dict] = []
+
+    for _ in range(runs):
+        output: str = subprocess.run(
+            [sys.executable, '-c', PROBE, profile],
+            capture_output=True,
+            check=True,
+            text=True
+        ).stdout
+
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    return samples
+
+def main() -> int:
+    """
+    Compares cold starts of the full and voter profiles.
+
+    With --check the exit status is 1 if the voter profile loads the admin
+    interface or starts no faster than the full profile.
+    """
+    parser = argparse.ArgumentParser(description='Measure create_app cold start time and memory per profile.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--check', action='store_true')
+    arguments = parser.parse_args()
+
+    results: Dict[str, List[Dict]] = {profile: measure(profile, arguments.runs) for profile in ('full', 'voter')}
+
+    for profile, samples in results.items():
+        print(
+            f"{profile:>6}: "
+            f"{statistics.median(sample['milliseconds'] for sample in samples):7.1f} ms median, "
+            f"{statistics.median(sample['max_rss_kb'] for sample in samples) / 1024:6.1f} MB max rss"
+        )
+
+    if not arguments.check:
+        return 0
+
+    voter: List[Dict] = results['voter']
+    full: List[Dict] = results['full']
+
+    if any(sample['admin_loaded'] for sample in voter):
+        print(f"voter profile loaded {voter[0]['admin_loaded']}")
+        return 1
+
+    if statistics.median(sample['milliseconds'] for sample in voter) >= statistics.median(sample['milliseconds'] for sample in full):
+        print("voter profile is not faster to start than the full profile")
+        return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+from typing import Any, Callable, ContextManager, Iterator, List, Optional
+from Engine import create_app, db
+from Engine.models import DataChange
+from Engine.config import Config
+from sqlalchemy import event, insert
+from contextlib import contextmanager
+from datetime import datetime
+from flask import Flask
+import pytest
+
+class TestConfig(Config):
+    TESTING = True
+    SECRET_KEY = 'test'
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    WTF_CSRF_ENABLED = False
+    SOCKETIO_MESSAGE_QUEUE = None
+    DATA_VERSION_POLL_INTERVAL = 0
+
+@pytest.fixture
+def app() -> Iterator[Flask]:
+    app: Flask = create_app(TestConfig)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def commit_from_another_worker(app: Flask) -> Callable[..., None]:
+    """
+    Returns a function that commits a change row as if another worker changed a cached row.
+    """
+    def commit(table_name: str, row_id: int, election_id: Optional[int] = None) -> None:
+        db.session.execute(insert(DataChange.__table__), [{
+            'origin': 'another-worker',
+            'table_name': table_name,
+            'row_id': row_id,
+            'election_id': election_id,
+            'created_at': datetime.now()
+        }])
+        db.session.commit()
+
+    return commit
+
+@pytest.fixture
+def count_queries(app: Flask) -> Callable[[], ContextManager[List[str]]]:
+    """
+    Returns a context manager that collects the statements run while it is open.
+    """
+    @contextmanager
+    def count() -> Iterator[List[str]]:
+        statements: List[str] = []
+
+        def record(connection: Any, cursor: Any, statement: str, *args: Any) -> None:
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+    return count
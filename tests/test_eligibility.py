@@ -0,0 +1,252 @@
+from Engine.models import Ballot, Candidate, Course, DataChange, Election, ElectionEligibility, Position, Voter
+from Engine.eligibility import BallotRejected, eligibility_index
+from Engine.data_version import data_version
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, text
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Callable, ContextManager, List, Optional, Tuple
+from flask import Flask
+from Engine import db
+import pytest
+
+def create_election(*rules: ElectionEligibility) -> Election:
+    election: Election = Election('Student Council', datetime.now() - timedelta(hours=1), datetime.now() + timedelta(hours=1))
+    db.session.add(election)
+    db.session.flush()
+
+    for rule in rules:
+        rule.election_id = election.id
+
+    db.session.add_all(rules)
+    db.session.commit()
+    eligibility_index.clear()
+
+    return election
+
+def add_voter(id_number: str, course: Optional[Course] = None) -> Voter:
+    voter: Voter = Voter(first_name='Voter', last_name=id_number, id_number=id_number, course_id=course.id if course else None)
+    db.session.add(voter)
+    db.session.commit()
+    return voter
+
+def test_accept_marks_the_voter_and_release_clears_it(app: Flask) -> None:
+    election: Election = create_election()
+    voter: Voter = add_voter('V0')
+
+    assert eligibility_index.accept(int(election.id), 'V0') == voter.id
+
+    with pytest.raises(BallotRejected, match='Already voted'):
+        eligibility_index.accept(int(election.id), 'V0')
+
+    eligibility_index.release(int(election.id), int(voter.id))
+
+    assert eligibility_index.accept(int(election.id), 'V0') == voter.id
+
+def test_voted_bits_are_kept_per_election(app: Flask) -> None:
+    first: Election = create_election()
+    second: Election = Election('Org Council', first.start_date_and_time, first.end_date_and_time)
+    db.session.add(second)
+    db.session.commit()
+    voters: List[Voter] = [add_voter(f'V{number}') for number in range(10)]
+
+    eligibility_index.accept(int(first.id), 'V9')
+
+    assert eligibility_index.accept(int(second.id), 'V9') == voters[9].id
+    assert eligibility_index.accept(int(first.id), 'V8') == voters[8].id
+
+    with pytest.raises(BallotRejected, match='Already voted'):
+        eligibility_index.accept(int(second.id), 'V9')
+
+def test_rejections(app: Flask) -> None:
+    election: Election = create_election()
+    add_voter('V0')
+
+    with pytest.raises(BallotRejected, match='not registered'):
+        eligibility_index.accept(int(election.id), 'V1')
+
+    with pytest.raises(BallotRejected, match='not open for voting'):
+        eligibility_index.accept(int(election.id), 'V0', now=datetime.now() + timedelta(days=1))
+
+    with pytest.raises(BallotRejected, match='not found'):
+        eligibility_index.accept(int(election.id) + 1, 'V0')
+
+def test_eligibility_rules(app: Flask) -> None:
+    engineering: Course = Course(name='Engineering')
+    nursing: Course = Course(name='Nursing')
+    db.session.add_all([engineering, nursing])
+    db.session.commit()
+
+    election: Election = create_election(ElectionEligibility(course_id=engineering.id))
+    add_voter('V0', engineering)
+    add_voter('V1', nursing)
+    add_voter('V2')
+
+    eligibility_index.accept(int(election.id), 'V0')
+
+    for id_number in ('V1', 'V2'):
+        with pytest.raises(BallotRejected, match='Not eligible'):
+            eligibility_index.accept(int(election.id), id_number)
+
+    # Voters added after the index was loaded get the bit of the open election
+    add_voter('V3', engineering)
+    eligibility_index.accept(int(election.id), 'V3')
+
+def test_validate_candidates(app: Flask) -> None:
+    election: Election = create_election()
+    other: Election = Election('Org Council', election.start_date_and_time, election.end_date_and_time)
+    president: Position = Position('President')
+    treasurer: Position = Position('Treasurer')
+    db.session.add_all([other, president, treasurer])
+    db.session.flush()
+
+    first: Candidate = Candidate('First', position_id=president.id, election_id=election.id)
+    second: Candidate = Candidate('Second', position_id=president.id, election_id=election.id)
+    third: Candidate = Candidate('Third', position_id=treasurer.id, election_id=election.id)
+    foreign: Candidate = Candidate('Foreign', position_id=treasurer.id, election_id=other.id)
+    db.session.add_all([first, second, third, foreign])
+    db.session.commit()
+
+    eligibility_index.validate_candidates(int(election.id), [int(first.id), int(third.id)])
+
+    with pytest.raises(BallotRejected, match='not running'):
+        eligibility_index.validate_candidates(int(election.id), [int(foreign.id)])
+
+    with pytest.raises(BallotRejected, match='one candidate'):
+        eligibility_index.validate_candidates(int(election.id), [int(first.id), int(second.id)])
+
+    with pytest.raises(BallotRejected, match='no candidates'):
+        eligibility_index.validate_candidates(int(election.id), [])
+
+def test_stored_ballots_are_loaded_as_voted(app: Flask) -> None:
+    election: Election = create_election()
+    voter: Voter = add_voter('V0')
+    db.session.add(Ballot(voter_id=voter.id, election_id=election.id))
+    db.session.commit()
+    eligibility_index.clear()
+
+    with pytest.raises(BallotRejected, match='Already voted'):
+        eligibility_index.accept(int(election.id), 'V0')
+
+def test_ballot_validation_does_not_read_the_database(app: Flask, count_queries: Callable[[], ContextManager[List[str]]]) -> None:
+    election: Election = create_election()
+    add_voter('V0')
+    add_voter('V1')
+    eligibility_index.open_election(int(election.id))
+
+    with count_queries() as statements:
+        eligibility_index.accept(int(election.id), 'V0')
+
+        with pytest.raises(BallotRejected):
+            eligibility_index.accept(int(election.id), 'V2')
+
+    assert statements == []
+
+def test_changes_from_another_worker_update_the_index(
+    app: Flask,
+    commit_from_another_worker: Callable[..., None],
+    count_queries: Callable[[], ContextManager[List[str]]]
+) -> None:
+    election: Election = create_election()
+    add_voter('V0')
+    data_version.sync()
+    eligibility_index.accept(int(election.id), 'V0')
+
+    # Inserted without the session so only the change row tells this worker
+    db.session.execute(insert(Voter.__table__), [{'first_name': 'Voter', 'last_name': 'V1', 'id_number': 'V1'}])
+    voter_id: int = db.session.query(Voter.id).filter_by(id_number='V1').scalar()
+    commit_from_another_worker('voters', voter_id)
+
+    with pytest.raises(BallotRejected, match='not registered'):
+        eligibility_index.accept(int(election.id), 'V1')
+
+    data_version.sync()
+
+    assert eligibility_index.accept(int(election.id), 'V1') == voter_id
+
+    # A voter change does not reload the elections
+    with count_queries() as statements, pytest.raises(BallotRejected, match='Already voted'):
+        eligibility_index.accept(int(election.id), 'V0')
+
+    assert statements == []
+
+    Election.query.filter_by(id=election.id).update({'end_date_and_time': datetime.now() - timedelta(minutes=1)}, synchronize_session=False)
+    commit_from_another_worker('elections', int(election.id), int(election.id))
+    data_version.sync()
+
+    with pytest.raises(BallotRejected, match='not open for voting'):
+        eligibility_index.accept(int(election.id), 'V1')
+
+def test_own_changes_are_skipped_and_old_changes_pruned(
+    app: Flask,
+    monkeypatch: pytest.MonkeyPatch,
+    commit_from_another_worker: Callable[..., None]
+) -> None:
+    data_version.sync()
+    voter: Voter = add_voter('V0')
+
+    assert DataChange.query.filter_by(origin=data_version.origin).count() == 1
+
+    reloaded: List[Any] = []
+    monkeypatch.setattr(eligibility_index, 'reload_voters', reloaded.append)
+    data_version.sync()
+
+    assert reloaded == []
+
+    commit_from_another_worker('voters', int(voter.id))
+    data_version.sync()
+
+    assert reloaded == [{voter.id}]
+
+    DataChange.query.update({'created_at': datetime.now() - timedelta(seconds=data_version.retention + 1)})
+    db.session.commit()
+    data_version.prune()
+
+    assert DataChange.query.count() == 0
+
+def create_ballot_election() -> Tuple[Election, Candidate, Voter]:
+    election: Election = create_election()
+    position: Position = Position('President')
+    db.session.add(position)
+    db.session.flush()
+
+    candidate: Candidate = Candidate('First', position_id=position.id, election_id=election.id)
+    db.session.add(candidate)
+    db.session.commit()
+
+    voter: Voter = add_voter('V0')
+    eligibility_index.open_election(int(election.id))
+
+    return election, candidate, voter
+
+def test_ballot_stored_by_another_worker_keeps_the_voted_bit(app: Flask) -> None:
+    election, candidate, voter = create_ballot_election()
+
+    # Inserted without this worker's index knowing
+    db.session.execute(insert(Ballot.__table__), [{'voter_id': voter.id, 'election_id': election.id}])
+    db.session.commit()
+
+    response = app.test_client().post(f'/election/{election.id}/ballot', data={'id_number': 'V0', 'candidate_id': candidate.id})
+
+    assert response.json == {'status': 'error', 'message': ['Already voted in this election']}
+
+    with pytest.raises(BallotRejected, match='Already voted'):
+        eligibility_index.accept(int(election.id), 'V0')
+
+def test_failed_ballot_releases_the_voted_bit(app: Flask) -> None:
+    election, candidate, voter = create_ballot_election()
+    candidate_id: int = int(candidate.id)
+
+    # The candidate was deleted without this worker's index knowing, so its vote breaks a foreign key
+    db.session.execute(delete(Candidate.__table__).where(Candidate.id == candidate_id))
+    db.session.commit()
+    db.session.execute(text('PRAGMA foreign_keys = ON'))
+
+    try:
+        with pytest.raises(IntegrityError):
+            app.test_client().post(f'/election/{election.id}/ballot', data={'id_number': 'V0', 'candidate_id': candidate_id})
+    finally:
+        db.session.rollback()
+        db.session.execute(text('PRAGMA foreign_keys = OFF'))
+
+    assert Ballot.query.count() == 0
+    assert eligibility_index.accept(int(election.id), 'V0') == voter.id
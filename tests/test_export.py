@@ -0,0 +1,108 @@
+from Engine.models import Candidate, Election, Position, User, Vote, Voter
+from Engine.export import views
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+from flask.testing import FlaskClient
+from flask import Flask
+from Engine import db
+import pytest
+import json
+import gzip
+import csv
+import io
+
+def create_votes() -> Tuple[Election, Election]:
+    elections: List[Election] = [
+        Election(title, datetime.now(), datetime.now() + timedelta(hours=1)) for title in ('Student Council', 'Org Council')
+    ]
+    position: Position = Position('President')
+    voters: List[Voter] = [Voter(first_name='Voter', last_name=str(number), id_number=f'V{number}') for number in range(3)]
+    db.session.add_all([*elections, position, *voters])
+    db.session.flush()
+
+    candidates: List[Candidate] = [
+        Candidate(f'Candidate {election.id}', position_id=position.id, election_id=election.id) for election in elections
+    ]
+    db.session.add_all(candidates)
+    db.session.flush()
+
+    db.session.add_all([
+        Vote(voter_id=voter.id, candidate_id=candidates[0].id, election_id=elections[0].id) for voter in voters
+    ])
+    db.session.add(Vote(voter_id=voters[0].id, candidate_id=candidates[1].id, election_id=elections[1].id))
+    db.session.commit()
+
+    return elections[0], elections[1]
+
+def logged_in(app: Flask) -> FlaskClient:
+    admin: User = User('admin', 'admin@example.com', 'hash')
+    db.session.add(admin)
+    db.session.commit()
+
+    client: FlaskClient = app.test_client()
+
+    with client.session_transaction() as session:
+        session['_user_id'] = str(admin.id)
+        session['_fresh'] = True
+
+    return client
+
+def test_votes_csv(app: Flask) -> None:
+    create_votes()
+    response = logged_in(app).get('/admin/export/votes.csv')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'filename="votes.csv"' in response.headers['Content-Disposition']
+
+    rows: List[Dict[str, str]] = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+    assert [row['election'] for row in rows] == ['Student Council'] * 3 + ['Org Council']
+    assert [row['voter_id_number'] for row in rows] == ['V0', 'V1', 'V2', 'V0']
+
+def test_results_ndjson(app: Flask) -> None:
+    create_votes()
+    response = logged_in(app).get('/admin/export/results.ndjson')
+
+    assert response.mimetype == 'application/x-ndjson'
+    assert [json.loads(line) for line in response.get_data(as_text=True).splitlines()] == [
+        {'election': 'Student Council', 'position': 'President', 'candidate': 'Candidate 1', 'candidate_id_number': None, 'votes': 3},
+        {'election': 'Org Council', 'position': 'President', 'candidate': 'Candidate 2', 'candidate_id_number': None, 'votes': 1}
+    ]
+
+def test_election_filter(app: Flask) -> None:
+    first, second = create_votes()
+    client: FlaskClient = logged_in(app)
+
+    votes: List[Dict[str, Any]] = [
+        json.loads(line) for line in client.get(f'/admin/export/votes.ndjson?election_id={second.id}').get_data(as_text=True).splitlines()
+    ]
+    results: List[Dict[str, str]] = list(csv.DictReader(io.StringIO(
+        client.get(f'/admin/export/results.csv?election_id={first.id}').get_data(as_text=True)
+    )))
+
+    assert [(vote['election'], vote['voter_id_number']) for vote in votes] == [('Org Council', 'V0')]
+    assert [(result['election'], result['votes']) for result in results] == [('Student Council', '3')]
+
+@pytest.mark.parametrize('file_format', ['csv', 'ndjson'])
+def test_gzip_decompresses_to_the_same_bytes(app: Flask, monkeypatch: pytest.MonkeyPatch, file_format: str) -> None:
+    # Small chunks so the stream is compressed in several pieces
+    monkeypatch.setattr(views, 'CHUNK_SIZE', 2)
+    create_votes()
+    client: FlaskClient = logged_in(app)
+
+    plain = client.get(f'/admin/export/votes.{file_format}')
+    compressed = client.get(f'/admin/export/votes.{file_format}?gzip=1')
+
+    assert compressed.mimetype == 'application/gzip'
+    assert f'filename="votes.{file_format}.gz"' in compressed.headers['Content-Disposition']
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+
+def test_unknown_format_is_not_found(app: Flask) -> None:
+    assert logged_in(app).get('/admin/export/votes.xml').status_code == 404
+
+def test_logged_out_users_are_redirected(app: Flask) -> None:
+    response = app.test_client().get('/admin/export/votes.csv')
+
+    assert response.status_code == 302
+    assert response.headers['Location'] == '/admin/login'
@@ -0,0 +1,95 @@
+from Engine.models import Candidate, Election, Position, Vote, Voter
+from Engine.idempotency import IdempotencyStore, idempotency_store
+from Engine.eligibility import eligibility_index
+from datetime import datetime, timedelta
+from flask import Flask
+from typing import Dict
+from Engine import db
+
+def election_form(title: str, idempotency_key: str) -> Dict[str, str]:
+    return {
+        'idempotency_key': idempotency_key,
+        'title': title,
+        'start_date_and_time': '2026-01-01T08:00',
+        'end_date_and_time': '2026-01-01T17:00',
+        'candidates-0-name': 'Juan Dela Cruz',
+        'candidates-0-image_filename': 'juan.png',
+        'candidates-0-id_number': 'C-1',
+        'candidates-0-position': 'President'
+    }
+
+def test_invalid_submission_is_not_replayed(app: Flask) -> None:
+    idempotency_store.clear()
+    client = app.test_client()
+
+    invalid = client.post('/admin/electionview/', data=election_form('', 'key-1'))
+
+    assert invalid.status_code == 200
+    assert Election.query.count() == 0
+
+    valid = client.post('/admin/electionview/', data=election_form('Student Council', 'key-1'))
+
+    assert valid.status_code == 302
+    assert 'Idempotent-Replayed' not in valid.headers
+    assert Election.query.count() == 1
+
+    replayed = client.post('/admin/electionview/', data=election_form('Student Council', 'key-1'))
+
+    assert replayed.status_code == 302
+    assert replayed.headers['Idempotent-Replayed'] == 'true'
+    assert Election.query.count() == 1
+
+def test_invalid_submission_renders_a_new_key(app: Flask) -> None:
+    idempotency_store.clear()
+    client = app.test_client()
+
+    invalid = client.post('/admin/electionview/', data=election_form('', 'key-2'))
+
+    assert b'key-2' not in invalid.data
+    assert b'name="idempotency_key"' in invalid.data
+
+def test_running_request_is_not_evicted() -> None:
+    store: IdempotencyStore = IdempotencyStore(max_entries=1)
+
+    running, owner = store.claim('a')
+    assert owner
+
+    store.claim('b')
+    entry, owner = store.claim('a')
+
+    assert entry is running
+    assert not owner
+
+def test_key_reused_by_another_voter_is_rejected(app: Flask) -> None:
+    idempotency_store.clear()
+    eligibility_index.clear()
+    client = app.test_client()
+
+    election: Election = Election('Student Council', datetime.now() - timedelta(hours=1), datetime.now() + timedelta(hours=1))
+    position: Position = Position('President')
+    db.session.add_all([election, position])
+    db.session.flush()
+
+    candidate: Candidate = Candidate('Juan Dela Cruz', position_id=position.id, election_id=election.id)
+    db.session.add_all([
+        candidate,
+        Voter(first_name='Ana', last_name='Reyes', id_number='V0'),
+        Voter(first_name='Ben', last_name='Santos', id_number='V3')
+    ])
+    db.session.commit()
+
+    url: str = f'/election/{election.id}/ballot'
+    first = client.post(url, data={'idempotency_key': 'ballot-1', 'id_number': 'V0', 'candidate_id': candidate.id})
+
+    assert first.json == {'status': 'success'}
+
+    reused = client.post(url, data={'idempotency_key': 'ballot-1', 'id_number': 'V3', 'candidate_id': candidate.id})
+
+    assert reused.status_code == 422
+    assert 'Idempotent-Replayed' not in reused.headers
+    assert Vote.query.count() == 1
+
+    retried = client.post(url, data={'idempotency_key': 'ballot-1', 'id_number': 'V0', 'candidate_id': candidate.id})
+
+    assert retried.headers['Idempotent-Replayed'] == 'true'
+    assert 'Set-Cookie' not in retried.headers
@@ -0,0 +1,203 @@
+from Engine.models import Candidate, Election, Position, Vote, Voter
+from Engine.leaderboard import PositionBoard, leaderboard
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from Engine.data_version import data_version
+from Engine import db, socketio
+from sqlalchemy import insert
+from flask import Flask
+import random
+
+def ranked(counts: Dict[int, int], size: int) -> List[int]:
+    return sorted(counts, key=lambda candidate_id: (-counts[candidate_id], candidate_id))[:size]
+
+def test_candidate_enters_and_moves_up() -> None:
+    board: PositionBoard = PositionBoard(2, {1: 2, 2: 1, 3: 0})
+
+    assert board.top == [1, 2]
+    assert not board.add_vote(3)
+    assert board.top == [1, 2]
+
+    assert board.add_vote(3)
+    assert board.top == [1, 3]
+
+    assert board.add_vote(3)
+    assert board.top == [3, 1]
+
+def test_count_change_without_reordering() -> None:
+    board: PositionBoard = PositionBoard(3, {1: 5, 2: 1})
+
+    assert not board.add_vote(1)
+    assert board.top == [1, 2]
+    assert board.counts[1] == 6
+
+def test_ties_keep_the_lower_candidate_id_first() -> None:
+    board: PositionBoard = PositionBoard(3, {1: 0, 2: 1, 3: 0})
+
+    assert board.top == [2, 1, 3]
+    assert board.add_vote(1)
+    assert board.top == [1, 2, 3]
+
+    # Catching up with a lower id does not pass it
+    assert not board.add_vote(3)
+    assert board.top == [1, 2, 3]
+
+    assert board.add_vote(2)
+    assert board.top == [2, 1, 3]
+
+def test_tie_with_last_entry_does_not_replace_a_lower_id() -> None:
+    board: PositionBoard = PositionBoard(1, {1: 1, 2: 0})
+
+    assert not board.add_vote(2)
+    assert board.top == [1]
+
+    board = PositionBoard(1, {1: 0, 2: 1})
+
+    assert board.add_vote(1)
+    assert board.top == [1]
+
+def test_incremental_order_matches_a_full_sort() -> None:
+    generator: random.Random = random.Random(7)
+
+    for size in (1, 3, 10):
+        counts: Dict[int, int] = {candidate_id: 0 for candidate_id in range(1, 9)}
+        board: PositionBoard = PositionBoard(size, dict(counts))
+
+        for _ in range(500):
+            candidate_id: int = generator.choice(list(counts))
+            counts[candidate_id] += 1
+            before: List[int] = list(board.top)
+
+            changed: bool = board.add_vote(candidate_id)
+
+            assert board.top == ranked(counts, size)
+            assert changed == (before != board.top)
+
+def create_election() -> Tuple[Election, List[Candidate]]:
+    election: Election = Election('Student Council', datetime.now(), datetime.now() + timedelta(hours=1))
+    position: Position = Position('President')
+    voter: Voter = Voter(first_name='Ana', last_name='Reyes')
+    db.session.add_all([election, position, voter])
+    db.session.flush()
+
+    candidates: List[Candidate] = [
+        Candidate(name, position_id=position.id, election_id=election.id) for name in ('First', 'Second')
+    ]
+    db.session.add_all(candidates)
+    db.session.commit()
+
+    return election, candidates
+
+def vote(election: Election, candidate: Candidate, vote_id: Optional[int] = None) -> Vote:
+    cast: Vote = Vote(id=vote_id, voter_id=1, candidate_id=candidate.id, election_id=election.id)
+    db.session.add(cast)
+    db.session.commit()
+    return cast
+
+def test_followers_receive_committed_votes(app: Flask) -> None:
+    election, (first, second) = create_election()
+    client = socketio.test_client(app)
+
+    client.emit('get_highest_rated_candidate', {'election_id': election.id})
+    loaded: List[Dict[str, Any]] = client.get_received()
+
+    assert [candidate['votes'] for candidate in loaded[0]['args'][0]['positions'][str(first.position_id)]] == [0, 0]
+
+    vote(election, second)
+    received: List[Dict[str, Any]] = client.get_received()
+
+    assert [
+        (candidate['id'], candidate['votes']) for candidate in received[0]['args'][0]['positions'][str(first.position_id)]
+    ] == [(second.id, 1), (first.id, 0)]
+
+def board(election: Election) -> Dict[str, Any]:
+    payload: Optional[Dict[str, Any]] = leaderboard.get(int(election.id))
+    assert payload is not None
+    return payload
+
+def test_votes_included_in_the_load_are_skipped(app: Flask) -> None:
+    election, (first, second) = create_election()
+    counted: Vote = vote(election, first, vote_id=5)
+    leaderboard.invalidate()
+
+    assert board(election)['positions'][first.position_id][0]['votes'] == 1
+
+    # The queue delivers the vote again after the board loaded it
+    assert not leaderboard.record_vote(int(election.id), int(first.id), int(counted.id))
+    assert board(election)['positions'][first.position_id][0]['votes'] == 1
+
+    # A vote committed later with a lower id than the newest loaded one is still counted
+    leaderboard.record_vote(int(election.id), int(second.id), 3)
+    assert board(election)['positions'][first.position_id][1]['votes'] == 1
+
+def wait_for_leaderboard(client: Any) -> List[Dict[str, Any]]:
+    for _ in range(100):
+        received: List[Dict[str, Any]] = client.get_received()
+
+        if received:
+            return received
+
+        socketio.sleep(0.01)
+
+    return []
+
+def test_followers_receive_the_reloaded_board_after_an_edit(app: Flask) -> None:
+    election, (first, second) = create_election()
+    client = socketio.test_client(app)
+    client.emit('get_highest_rated_candidate', {'election_id': election.id})
+    client.get_received()
+
+    added: Candidate = Candidate('Added', position_id=first.position_id, election_id=election.id)
+    db.session.add(added)
+    db.session.delete(second)
+    db.session.commit()
+    edited: List[Dict[str, Any]] = wait_for_leaderboard(client)
+
+    assert [candidate['name'] for candidate in edited[0]['args'][0]['positions'][str(first.position_id)]] == ['First', 'Added']
+
+    vote(election, added)
+    received: List[Dict[str, Any]] = wait_for_leaderboard(client)
+
+    assert [
+        (candidate['name'], candidate['votes']) for candidate in received[0]['args'][0]['positions'][str(first.position_id)]
+    ] == [('Added', 1), ('First', 0)]
+
+def test_followers_receive_the_candidate_another_worker_added(app: Flask, commit_from_another_worker: Callable[..., None]) -> None:
+    election, (first, second) = create_election()
+    client = socketio.test_client(app)
+    client.emit('get_highest_rated_candidate', {'election_id': election.id})
+    client.get_received()
+    data_version.sync()
+
+    # Inserted without the session so only the change row tells this worker
+    db.session.execute(insert(Candidate.__table__), [
+        {'name': 'Third', 'position_id': first.position_id, 'election_id': election.id}
+    ])
+    third_id: int = db.session.query(Candidate.id).filter_by(name='Third').scalar()
+    vote(election, Candidate.query.filter_by(id=third_id).one())
+
+    # The board dropped by the unknown candidate is sent again without it
+    assert len(wait_for_leaderboard(client)[0]['args'][0]['positions'][str(first.position_id)]) == 2
+
+    commit_from_another_worker('candidates', third_id, int(election.id))
+    data_version.sync()
+    received: List[Dict[str, Any]] = wait_for_leaderboard(client)
+
+    assert [
+        (candidate['id'], candidate['votes']) for candidate in received[-1]['args'][0]['positions'][str(first.position_id)]
+    ] == [(third_id, 1), (first.id, 0), (second.id, 0)]
+
+def test_unknown_elections_are_ignored(app: Flask) -> None:
+    election, candidates = create_election()
+    leaderboard.invalidate()
+    client = socketio.test_client(app)
+
+    client.emit('get_highest_rated_candidate', {'election_id': 999999})
+
+    assert client.get_received() == []
+    assert leaderboard.payload(999999) is None
+    assert leaderboard.get(999999) is None
+
+    client.emit('get_highest_rated_candidate')
+
+    assert client.get_received()[0]['args'][0]['election_id'] == election.id
@@ -0,0 +1,87 @@
+from Engine.models import Candidate, Election, Position
+from Engine.read_models import ElectionDTO, election_read_model
+from Engine.data_version import data_version
+from datetime import datetime, timedelta
+from typing import Callable, ContextManager, List, Optional, Tuple
+from sqlalchemy import update
+from flask import Flask
+from Engine import db
+
+def create_elections() -> Tuple[Election, Election, Position]:
+    position: Position = Position('President')
+    elections: List[Election] = [
+        Election(title, datetime.now(), datetime.now() + timedelta(hours=1)) for title in ('Student Council', 'Org Council')
+    ]
+    db.session.add_all([position, *elections])
+    db.session.flush()
+
+    db.session.add_all([
+        Candidate(f'Candidate {election.id}', position_id=position.id, election_id=election.id) for election in elections
+    ])
+    db.session.commit()
+
+    return elections[0], elections[1], position
+
+def test_another_worker_invalidates_only_the_changed_election(
+    app: Flask,
+    commit_from_another_worker: Callable[..., None],
+    count_queries: Callable[[], ContextManager[List[str]]]
+) -> None:
+    first, second, position = create_elections()
+    first_id, second_id = int(first.id), int(second.id)
+    data_version.sync()
+    cached: List[ElectionDTO] = election_read_model.all()
+
+    candidate: Candidate = Candidate.query.filter_by(election_id=first.id).one()
+    db.session.execute(update(Candidate).where(Candidate.id == candidate.id).values(name='Renamed'))
+    commit_from_another_worker('candidates', int(candidate.id), first_id)
+    data_version.sync()
+
+    with count_queries() as statements:
+        assert election_read_model.get(second_id) in cached
+        assert statements == []
+
+        reloaded: Optional[ElectionDTO] = election_read_model.get(first_id)
+
+    assert reloaded is not None
+    assert [dto.name for dto in reloaded.candidates] == ['Renamed']
+
+def test_position_change_invalidates_every_election(app: Flask, commit_from_another_worker: Callable[..., None]) -> None:
+    first, second, position = create_elections()
+    data_version.sync()
+    cached: List[ElectionDTO] = election_read_model.all()
+
+    db.session.execute(update(Position).where(Position.id == position.id).values(name='Chairperson'))
+    commit_from_another_worker('positions', int(position.id))
+    data_version.sync()
+
+    for election in election_read_model.all():
+        assert election not in cached
+        assert [dto.position.name for dto in election.candidates] == ['Chairperson']
+
+def test_loading_takes_the_same_queries_for_any_number_of_candidates(
+    app: Flask,
+    count_queries: Callable[[], ContextManager[List[str]]]
+) -> None:
+    first, second, position = create_elections()
+    positions: List[Position] = [Position(f'Position {number}') for number in range(20)]
+    db.session.add_all(positions)
+    db.session.flush()
+
+    db.session.add_all([
+        Candidate(f'Candidate {number}', position_id=positions[number % 20].id, election_id=second.id) for number in range(50)
+    ])
+    db.session.commit()
+
+    loads: List[Tuple[int, int]] = []
+
+    for election_id in (int(first.id), int(second.id)):
+        election_read_model.invalidate()
+
+        with count_queries() as statements:
+            loaded: Optional[ElectionDTO] = election_read_model.get(election_id)
+
+        assert loaded is not None
+        loads.append((len(loaded.candidates), len(statements)))
+
+    assert loads == [(1, 2), (51, 2)]
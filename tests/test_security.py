@@ -0,0 +1,139 @@
+from Engine.user.security import HashingBusy, HashingPool, TokenBucketLimiter, hashing_pool
+from Engine.user import security
+from typing import Any, Dict, Iterator, List
+from sqlalchemy import insert
+from Engine.models import User
+from flask import Flask
+from Engine import db
+import threading
+import pytest
+
+class Blocked:
+    """
+    Password checks that wait until `release` is set.
+    """
+    def __init__(self) -> None:
+        self.started: threading.Event = threading.Event()
+        self.release: threading.Event = threading.Event()
+
+    def __call__(self, password_hash: str, password: str) -> bool:
+        self.started.set()
+        self.release.wait(5)
+        return True
+
+@pytest.fixture
+def blocked(monkeypatch: pytest.MonkeyPatch) -> Iterator[Blocked]:
+    check: Blocked = Blocked()
+    monkeypatch.setattr(security, 'check_password_hash', check)
+    yield check
+    check.release.set()
+
+def test_hashing_pool_rejects_requests_over_the_slot_limit(blocked: Blocked) -> None:
+    pool: HashingPool = HashingPool(max_workers=1, max_pending=0, timeout=5)
+    results: List[bool] = []
+    running: threading.Thread = threading.Thread(target=lambda: results.append(pool.check('hash', 'password')))
+    running.start()
+    blocked.started.wait(5)
+
+    pool.timeout = 0.05
+
+    with pytest.raises(HashingBusy):
+        pool.check('hash', 'password')
+
+    pool.timeout = 5
+    blocked.release.set()
+    running.join()
+
+    assert results == [True]
+    assert pool.check('hash', 'password')
+
+def test_abandoned_hashes_keep_their_slot(blocked: Blocked) -> None:
+    pool: HashingPool = HashingPool(max_workers=1, max_pending=0, timeout=0.05)
+
+    # The result does not come in time
+    with pytest.raises(HashingBusy):
+        pool.check('hash', 'password')
+
+    # The hash still runs, so there is no slot for another
+    with pytest.raises(HashingBusy):
+        pool.check('hash', 'password')
+
+    pool.timeout = 5
+    blocked.release.set()
+
+    assert pool.check('hash', 'password')
+
+class Clock:
+    def __init__(self) -> None:
+        self.now: float = 1000
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_token_bucket_bursts_then_refills(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock: Clock = Clock()
+    monkeypatch.setattr(security.time, 'monotonic', clock)
+    limiter: TokenBucketLimiter = TokenBucketLimiter(capacity=3, refill_rate=1 / 12)
+
+    assert [limiter.consume('10.0.0.1') for _ in range(3)] == [0, 0, 0]
+    assert limiter.consume('10.0.0.1') == pytest.approx(12)
+    # Other clients have their own bucket
+    assert limiter.consume('10.0.0.2') == 0
+
+    clock.now += 6
+    assert limiter.consume('10.0.0.1') == pytest.approx(6)
+
+    clock.now += 6
+    assert limiter.consume('10.0.0.1') == 0
+    assert limiter.consume('10.0.0.1') == pytest.approx(12)
+
+    # Refilling never goes over the burst size
+    clock.now += 3600
+    assert [limiter.consume('10.0.0.1') for _ in range(4)][-1] == pytest.approx(12)
+
+def test_full_buckets_are_pruned(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock: Clock = Clock()
+    monkeypatch.setattr(security.time, 'monotonic', clock)
+    limiter: TokenBucketLimiter = TokenBucketLimiter(capacity=2, refill_rate=1, max_keys=2)
+
+    limiter.consume('first')
+    limiter.consume('second')
+    clock.now += 10
+    limiter.consume('third')
+
+    assert list(limiter._buckets) == ['third']
+
+def test_login_attempts_over_the_limit_get_429(app: Flask) -> None:
+    client = app.test_client()
+    form: Dict[str, str] = {'login_email': 'nobody@example.com', 'login_password': 'wrong'}
+
+    for _ in range(5):
+        assert client.post('/admin/login', data=form).status_code == 200
+
+    response = client.post('/admin/login', data=form)
+
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '12'
+    assert response.get_json()['status'] == 'error'
+
+def test_registration_racing_another_reports_the_taken_fields(app: Flask, monkeypatch: pytest.MonkeyPatch) -> None:
+    def generate(password: str) -> str:
+        # Another registration commits the same username between validation and commit
+        with db.engine.begin() as connection:
+            connection.execute(insert(User.__table__), [
+                {'username': 'admin', 'email': 'other@example.com', 'password_hash': 'hash'}
+            ])
+
+        return 'hash'
+
+    monkeypatch.setattr(hashing_pool, 'generate', generate)
+
+    response: Any = app.test_client().post('/admin/register', data={
+        'register_username': 'admin',
+        'register_email': 'admin@example.com',
+        'register_password': 'Secure@123',
+        'register_key': 'AS34FH3'
+    })
+
+    assert response.get_json() == {'status': 'error', 'message': [['Username already taken']]}
+    assert User.query.count() == 1
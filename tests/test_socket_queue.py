@@ -0,0 +1,107 @@
+from Engine.socket_queue import WORKER_NAMESPACE, BoundedManager, SQLiteManager, on_worker_message
+from Engine import socket_queue
+from typing import Any, Callable, Dict, List, Tuple
+from socketio.packet import Packet # type: ignore
+from queue import Queue
+from pathlib import Path
+from uuid import uuid4
+import threading
+import logging
+import pytest
+import time
+
+class Server:
+    """
+    The parts of a Socket.IO server a client manager uses, recording the packets it sends.
+    """
+    packet_class = Packet
+    logger: logging.Logger = logging.getLogger('test_socket_queue')
+
+    def __init__(self) -> None:
+        self.eio: Any = self
+        self.sockets: Dict[str, Any] = {}
+        self.sent: List[Tuple[str, str]] = []
+
+    def generate_id(self) -> str:
+        return uuid4().hex
+
+    def connect(self, manager: BoundedManager, pending: int = 0) -> str:
+        eio_sid: str = self.generate_id()
+        self.sockets[eio_sid] = type('Socket', (), {'queue': Queue()})()
+
+        for _ in range(pending):
+            self.sockets[eio_sid].queue.put('packet')
+
+        manager.connect(eio_sid, '/')
+        return eio_sid
+
+    def _send_eio_packet(self, eio_sid: str, packet: Any) -> None:
+        self.sent.append((eio_sid, packet.data))
+
+    def start_background_task(self, target: Callable[..., Any], *args: Any) -> threading.Thread:
+        thread: threading.Thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        return thread
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+def manager_for(manager: BoundedManager) -> Tuple[BoundedManager, Server]:
+    server: Server = Server()
+    manager.set_server(server)
+    manager.initialize()
+    return manager, server
+
+def wait_until(condition: Callable[[], bool]) -> None:
+    deadline: float = time.monotonic() + 5
+
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def test_clients_with_a_full_send_queue_are_skipped() -> None:
+    manager, server = manager_for(BoundedManager(max_pending=2))
+    idle: str = server.connect(manager)
+    busy: str = server.connect(manager, pending=1)
+    server.connect(manager, pending=2)
+
+    manager.emit('highest_rated_candidate', {'election_id': 1}, namespace='/')
+
+    assert sorted(eio_sid for eio_sid, _ in server.sent) == sorted([idle, busy])
+
+def test_worker_messages_are_not_sent_to_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(socket_queue, '_worker_handlers', {})
+    received: List[Any] = []
+    on_worker_message('ping')(received.append)
+    manager, server = manager_for(BoundedManager())
+    server.connect(manager)
+
+    manager.emit('ping', [1, 2], namespace=WORKER_NAMESPACE)
+
+    assert received == [[1, 2]]
+    assert server.sent == []
+
+def test_sqlite_manager_delivers_between_managers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(socket_queue, '_worker_handlers', {})
+    received: List[Any] = []
+    on_worker_message('ping')(received.append)
+
+    path: str = str(tmp_path / 'socketio.db')
+    sender, sender_server = manager_for(SQLiteManager(path, poll_interval=0.01))
+    listener, listener_server = manager_for(SQLiteManager(path, poll_interval=0.01))
+    other_channel, other_server = manager_for(SQLiteManager(path, channel='other', poll_interval=0.01))
+    eio_sid: str = listener_server.connect(listener)
+    other_server.connect(other_channel)
+
+    # Listeners only read messages published after they started
+    time.sleep(0.05)
+    sender.emit('highest_rated_candidate', {'election_id': 1}, namespace='/')
+    sender.emit('ping', [1, 2], namespace=WORKER_NAMESPACE)
+
+    wait_until(lambda: len(received) == 2 and len(listener_server.sent) == 1)
+
+    assert [sent_eio_sid for sent_eio_sid, _ in listener_server.sent] == [eio_sid]
+    assert '"election_id":1' in listener_server.sent[0][1]
+    # Handled once by the sending worker and once by the listening one
+    assert received == [[1, 2]] * 2
+    assert sender_server.sent == []
+    assert other_server.sent == []
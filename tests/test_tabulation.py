@@ -0,0 +1,145 @@
+from Engine.tabulation import NO_CHOICE, Round, build_ballots, instant_runoff, tabulate
+from Engine.models import Candidate, Election, Position, RankedVote, Voter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from flask import Flask
+from Engine import db
+import numpy as np
+import random
+import time
+
+def reference_runoff(ballots: List[List[int]], candidates: List[int]) -> List[Round]:
+    """
+    Plain-Python instant-runoff with the same tie-breaking rules as instant_runoff.
+    """
+    standing: List[int] = sorted(candidates)
+    history: List[Dict[int, int]] = []
+    rounds: List[Round] = []
+
+    while True:
+        counts: Dict[int, int] = {candidate_id: 0 for candidate_id in standing}
+        live: int = 0
+
+        for ballot in ballots:
+            choice: Optional[int] = next((candidate_id for candidate_id in ballot if candidate_id in counts), None)
+
+            if choice is not None:
+                counts[choice] += 1
+                live += 1
+
+        history.append(counts)
+        leader: int = max(standing, key=lambda candidate_id: (counts[candidate_id], -candidate_id))
+
+        if counts[leader] * 2 > live or len(standing) == 1:
+            rounds.append(Round(len(rounds) + 1, counts, len(ballots) - live, None, leader))
+            return rounds
+
+        tied: List[int] = standing
+
+        for earlier in reversed(history):
+            fewest: int = min(earlier.get(candidate_id, 0) for candidate_id in tied)
+            tied = [candidate_id for candidate_id in tied if earlier.get(candidate_id, 0) == fewest]
+
+            if len(tied) == 1:
+                break
+
+        loser: int = tied[-1]
+        standing = [candidate_id for candidate_id in standing if candidate_id != loser]
+        rounds.append(Round(len(rounds) + 1, counts, len(ballots) - live, loser, None))
+
+def matrix(ballots: List[List[int]], candidates: List[int]) -> np.ndarray:
+    voter_ids: List[int] = [voter_id for voter_id, ballot in enumerate(ballots) for _ in ballot]
+    candidate_ids: List[int] = [candidate_id for ballot in ballots for candidate_id in ballot]
+
+    return build_ballots(
+        np.array(voter_ids, dtype=np.int64),
+        np.array(candidate_ids, dtype=np.int64),
+        np.array(sorted(candidates), dtype=np.int64)
+    )
+
+def test_build_ballots_pads_shorter_ballots() -> None:
+    ballots: np.ndarray = matrix([[20, 10], [30], [10, 30, 20]], [10, 20, 30])
+
+    assert ballots.tolist() == [[1, 0, NO_CHOICE], [2, NO_CHOICE, NO_CHOICE], [0, 2, 1]]
+
+def test_majority_in_the_first_round() -> None:
+    rounds: List[Round] = instant_runoff(matrix([[1], [1], [2]], [1, 2]), np.array([1, 2]))
+
+    assert rounds == [Round(1, {1: 2, 2: 1}, 0, None, 1)]
+
+def test_transfers_and_exhausted_ballots() -> None:
+    ballots: List[List[int]] = [[1, 3]] * 4 + [[2, 3]] * 3 + [[3, 2]] * 2 + [[3]]
+    rounds: List[Round] = instant_runoff(matrix(ballots, [1, 2, 3]), np.array([1, 2, 3]))
+
+    assert rounds == [
+        Round(1, {1: 4, 2: 3, 3: 3}, 0, 3, None),
+        Round(2, {1: 4, 2: 5}, 1, None, 2)
+    ]
+
+def test_last_place_tie_is_broken_by_earlier_rounds() -> None:
+    # 2 and 3 tie in round 2, 2 had fewer votes in round 1 and is eliminated
+    ballots: List[List[int]] = [[1]] * 5 + [[2]] * 3 + [[3]] * 4 + [[4, 2]] + [[4]]
+    candidates: List[int] = [1, 2, 3, 4]
+    rounds: List[Round] = instant_runoff(matrix(ballots, candidates), np.array(candidates))
+
+    assert [result.eliminated for result in rounds[:2]] == [4, 2]
+    assert rounds[1].tallies == {1: 5, 2: 4, 3: 4}
+    assert rounds == reference_runoff(ballots, candidates)
+
+def test_tie_in_every_round_eliminates_the_higher_id() -> None:
+    rounds: List[Round] = instant_runoff(matrix([[1], [2], [3], [3]], [1, 2, 3]), np.array([1, 2, 3]))
+
+    assert rounds[0].eliminated == 2
+    assert rounds[1] == Round(2, {1: 1, 3: 2}, 1, None, 3)
+
+def test_no_ballots_and_no_candidates() -> None:
+    assert instant_runoff(np.empty((0, 0), dtype=np.int32), np.array([], dtype=np.int64)) == []
+    assert instant_runoff(np.empty((0, 0), dtype=np.int32), np.array([5, 7])) == [
+        Round(1, {5: 0, 7: 0}, 0, 7, None),
+        Round(2, {5: 0}, 0, None, 5)
+    ]
+
+def test_matches_reference_on_50k_ballots() -> None:
+    generator: random.Random = random.Random(2024)
+    candidates: List[int] = [3, 8, 11, 15, 21, 34, 35, 40, 52, 60, 61, 77, 80, 91, 99]
+    popularity: Dict[int, float] = {candidate_id: 1 / (index + 1) for index, candidate_id in enumerate(candidates)}
+    ballots: List[List[int]] = []
+
+    for _ in range(50_000):
+        # Weighted shuffle, more popular candidates tend to be ranked higher
+        order: List[int] = sorted(candidates, key=lambda candidate_id: -generator.random() ** (1 / popularity[candidate_id]))
+        ballots.append(order[:generator.randint(1, len(candidates))])
+
+    packed: np.ndarray = matrix(ballots, candidates)
+
+    started: float = time.perf_counter()
+    rounds: List[Round] = instant_runoff(packed, np.array(candidates))
+    elapsed: float = time.perf_counter() - started
+
+    assert rounds == reference_runoff(ballots, candidates)
+    assert len(rounds) > 5
+    assert elapsed < 0.5
+
+def test_tabulate_reads_ranked_votes(app: Flask) -> None:
+    election: Election = Election('Student Council', datetime.now(), datetime.now() + timedelta(hours=1))
+    position: Position = Position('President')
+    voters: List[Voter] = [Voter(first_name='Voter', last_name=str(number)) for number in range(3)]
+    db.session.add_all([election, position, *voters])
+    db.session.flush()
+
+    first: Candidate = Candidate('First', position_id=position.id, election_id=election.id)
+    second: Candidate = Candidate('Second', position_id=position.id, election_id=election.id)
+    db.session.add_all([first, second])
+    db.session.flush()
+
+    for voter, ballot in zip(voters, [[first, second], [second], [second, first]]):
+        db.session.add_all([
+            RankedVote(voter_id=voter.id, candidate_id=candidate.id, election_id=election.id, position_id=position.id, rank=rank)
+            for rank, candidate in enumerate(ballot, start=1)
+        ])
+
+    db.session.commit()
+
+    assert tabulate(int(election.id), int(position.id)) == [
+        Round(1, {int(first.id): 1, int(second.id): 2}, 0, None, int(second.id))
+    ]
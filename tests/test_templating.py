@@ -0,0 +1,28 @@
+from Engine.templating import check_cache_directory
+from pathlib import Path
+import pytest
+import os
+
+def test_cache_directory_is_created_private(tmp_path: Path) -> None:
+    path: Path = tmp_path / 'jinja'
+
+    check_cache_directory(str(path))
+
+    assert path.is_dir()
+    assert path.stat().st_mode & 0o077 == 0
+
+def test_cache_directory_writable_by_others_is_refused(tmp_path: Path) -> None:
+    path: Path = tmp_path / 'jinja'
+    path.mkdir()
+    os.chmod(path, 0o777)
+
+    with pytest.raises(RuntimeError, match='cannot write'):
+        check_cache_directory(str(path))
+
+def test_cache_directory_symlink_is_refused(tmp_path: Path) -> None:
+    target: Path = tmp_path / 'target'
+    target.mkdir(mode=0o700)
+    (tmp_path / 'jinja').symlink_to(target)
+
+    with pytest.raises(RuntimeError):
+        check_cache_directory(str(tmp_path / 'jinja'))